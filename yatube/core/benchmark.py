@@ -0,0 +1,411 @@
+"""
+Замеры производительности на отдельной базе.
+
+Команда ``manage.py benchmark`` создаёт временную базу, заполняет её
+пользователями, группами и постами (см. seed_database) и запускает наборы
+замеров. Набор — функция, помеченная декоратором suite: она получает
+Benchmark и записывает в него результаты через Benchmark.measure().
+Набор routes определён здесь, наборы приложений лежат в их модулях
+benchmarks.
+
+Результаты сохраняются в JSON; compare() сравнивает прогон с сохранённым
+базовым и находит регрессии.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import partial
+from http.client import HTTPConnection
+from importlib import import_module
+from random import Random
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.servers.basehttp import (ThreadedWSGIServer,
+                                          WSGIRequestHandler,
+                                          get_internal_wsgi_application)
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from posts.archive import explicit_pub_date
+from posts.models import AuthorStats, Group, Post, make_title_key
+
+from . import perf
+
+User = get_user_model()
+
+SUITES = {}
+
+ROUTE_MODULES = ('posts.urls', 'users.urls', 'about.urls')
+
+# Маршруты, которые открываются от имени автора поста; остальные —
+# от имени гостя, как большинство запросов на сайте.
+AUTHENTICATED_ROUTES = {
+    'posts:post_create',
+    'posts:post_edit',
+    'posts:group_lookup',
+    'users:password_change',
+    'users:password_change_done',
+}
+
+WORDS = (
+    'текст', 'пост', 'группа', 'автор', 'лента', 'новости', 'город',
+    'погода', 'книга', 'музыка', 'кино', 'работа', 'отпуск', 'море',
+    'горы', 'кофе', 'утро', 'вечер', 'python', 'django',
+)
+
+ROUTE_QUERIES = {
+    'posts:search': {'q': WORDS[0]},
+    'posts:group_lookup': {'q': 'Гру'},
+}
+
+# Рост задержки меньше этого значения считается шумом.
+NOISE_MS = 0.5
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def suite(name):
+    """Регистрирует функцию как набор замеров."""
+    def decorator(func):
+        SUITES[name] = func
+        return func
+    return decorator
+
+
+@contextmanager
+def benchmark_database(using=DEFAULT_DB_ALIAS):
+    """Создаёт отдельную базу на время замеров и удаляет её после.
+
+    SQLite размещается в файле во временном каталоге, а не в памяти:
+    потоки WSGI-сервера открывают свои соединения, как в продакшене.
+    """
+    connection = connections[using]
+    test_settings = connection.settings_dict['TEST']
+    test_name = test_settings['NAME']
+    directory = None
+    if connection.vendor == 'sqlite':
+        directory = tempfile.mkdtemp(prefix='yatube-benchmark-')
+        test_settings['NAME'] = os.path.join(directory, 'db.sqlite3')
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings['NAME'] = test_name
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+class Dataset:
+    """Размеры заполненной базы и объекты, на которые ссылаются URL."""
+
+    def __init__(self, sizes, author, group, post):
+        self.sizes = sizes
+        self.author = author
+        self.group = group
+        self.post = post
+
+
+def make_text(random):
+    words = random.choices(WORDS, k=random.randint(5, 120))
+    return ' '.join(words).capitalize()
+
+
+def seed_database(users=100, groups=20, posts=10000, seed=0,
+                  batch_size=1000):
+    """Заполняет базу воспроизводимым набором данных.
+
+    Посты создаются через bulk_create с готовым HTML и разными датами
+    публикации за последний год; счётчики авторов заполняются сразу.
+    """
+    if min(users, groups, posts) < 1:
+        raise BenchmarkError('Нужны хотя бы один автор, группа и пост.')
+    random = Random(seed)
+
+    password = make_password(None)
+    User.objects.bulk_create(
+        User(username=f'user_{number}', password=password)
+        for number in range(users)
+    )
+    Group.objects.bulk_create(
+        Group(
+            title=f'Группа {number}',
+            title_key=make_title_key(f'Группа {number}'),
+            slug=f'group-{number}',
+            description=make_text(random),
+        )
+        for number in range(groups)
+    )
+    author_ids = list(User.objects.values_list('pk', flat=True))
+    group_ids = list(Group.objects.values_list('pk', flat=True))
+
+    now = timezone.now()
+    year = int(timedelta(days=365).total_seconds())
+    counts = Counter()
+    with explicit_pub_date():
+        for start in range(0, posts, batch_size):
+            batch = []
+            for _ in range(min(batch_size, posts - start)):
+                post = Post(
+                    text=make_text(random),
+                    author_id=random.choice(author_ids),
+                    group_id=(
+                        random.choice(group_ids)
+                        if random.random() < 0.8 else None
+                    ),
+                    pub_date=now - timedelta(seconds=random.randrange(year)),
+                )
+                post.render()
+                counts[post.author_id] += 1
+                batch.append(post)
+            Post.objects.bulk_create(batch)
+    AuthorStats.objects.bulk_create(
+        AuthorStats(author_id=author_id, posts_count=posts_count)
+        for author_id, posts_count in counts.items()
+    )
+
+    # Страницы открываются для последнего поста, его автора и группы
+    # последнего поста с группой: они попадают на первые страницы лент.
+    post = Post.objects.select_related('author').latest('pub_date')
+    group = (
+        Group.objects.filter(posts__isnull=False)
+        .order_by('-posts__pub_date')
+        .first()
+    )
+    sizes = {'users': users, 'groups': groups, 'posts': posts, 'seed': seed}
+    return Dataset(sizes, post.author, group, post)
+
+
+def summarize(timings, elapsed):
+    """Перцентили задержки в миллисекундах и число запросов в секунду."""
+    ordered = sorted(timings)
+    result = {
+        f'p{percent}': round(perf.percentile(ordered, percent), 3)
+        for percent in perf.PERCENTILES
+    }
+    result['max'] = round(ordered[-1], 3)
+    result['mean'] = round(sum(ordered) / len(ordered), 3)
+    result['rps'] = round(len(ordered) / elapsed, 1) if elapsed else 0.0
+    return result
+
+
+def measure(func, repeat, warmup=0, concurrency=1):
+    """Вызывает func repeat раз в concurrency потоков и возвращает сводку."""
+    for _ in range(warmup):
+        func()
+
+    def timed(_):
+        started = time.perf_counter()
+        func()
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            timings = list(executor.map(timed, range(repeat)))
+    else:
+        timings = [timed(number) for number in range(repeat)]
+    return summarize(timings, time.perf_counter() - started)
+
+
+def measure_memory(func):
+    """Пик памяти в КиБ, выделенной Python за один вызов func."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+class Benchmark:
+    """Параметры прогона и собранные результаты по наборам."""
+
+    def __init__(self, dataset, requests=50, warmup=5, concurrency=1):
+        self.dataset = dataset
+        self.requests = requests
+        self.warmup = warmup
+        self.concurrency = concurrency
+        self.results = defaultdict(dict)
+
+    def measure(self, suite_name, case, func, concurrency=1):
+        result = measure(func, self.requests, self.warmup, concurrency)
+        self.results[suite_name][case] = result
+        return result
+
+    def as_dict(self):
+        return {
+            'meta': {
+                'created': timezone.now().isoformat(),
+                'dataset': self.dataset.sizes,
+                'requests': self.requests,
+                'warmup': self.warmup,
+                'concurrency': self.concurrency,
+            },
+            'suites': dict(self.results),
+        }
+
+
+def compare(baseline, current, threshold=0.2):
+    """Находит регрессии текущего прогона относительно базового.
+
+    Регрессия — рост p50 больше чем в threshold раз (и больше NOISE_MS)
+    или рост числа SQL-запросов. Возвращает кортежи (набор, случай,
+    метрика, было, стало).
+    """
+    regressions = []
+    for suite_name, cases in current['suites'].items():
+        baseline_cases = baseline.get('suites', {}).get(suite_name, {})
+        for case, result in sorted(cases.items()):
+            before = baseline_cases.get(case)
+            if before is None:
+                continue
+            growth = result['p50'] - before['p50']
+            if growth > max(before['p50'] * threshold, NOISE_MS):
+                regressions.append(
+                    (suite_name, case, 'p50', before['p50'], result['p50'])
+                )
+            if result.get('sql_count', 0) > before.get('sql_count', 0):
+                regressions.append((
+                    suite_name, case, 'sql_count',
+                    before.get('sql_count', 0), result['sql_count'],
+                ))
+    return regressions
+
+
+def iter_routes(dataset):
+    """Выдаёт пары (имя маршрута, URL) для всех маршрутов ROUTE_MODULES.
+
+    Токен сброса пароля зависит от last_login, поэтому URL нужно строить
+    после входа автора.
+    """
+    author = dataset.author
+    values = {
+        'slug': dataset.group.slug,
+        'username': author.username,
+        'post_id': dataset.post.pk,
+        'uidb64': urlsafe_base64_encode(force_bytes(author.pk)),
+        'token': default_token_generator.make_token(author),
+    }
+    for module_name in ROUTE_MODULES:
+        module = import_module(module_name)
+        for pattern in module.urlpatterns:
+            name = f'{module.app_name}:{pattern.name}'
+            arguments = pattern.pattern.converters
+            missing = set(arguments) - set(values)
+            if missing:
+                raise BenchmarkError(
+                    f'Нет значений для {", ".join(sorted(missing))} '
+                    f'в маршруте {name}.'
+                )
+            url = reverse(name, kwargs={key: values[key] for key in arguments})
+            if name in ROUTE_QUERIES:
+                url += '?' + urlencode(ROUTE_QUERIES[name])
+            yield name, url
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_wsgi():
+    """Запускает WSGI-приложение проекта в потоке на свободном порту."""
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler)
+    server.set_app(get_internal_wsgi_application())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[:2]
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def http_get(address, url, cookie=None):
+    connection = HTTPConnection(*address, timeout=30)
+    try:
+        headers = {'Cookie': cookie} if cookie else {}
+        connection.request('GET', url, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+
+def client_get(client, url):
+    return client.get(url).status_code
+
+
+@suite('routes')
+def route_suite(benchmark):
+    """Задержка маршрутов через тестовый клиент и локальный WSGI-сервер.
+
+    Кеш очищается перед каждым маршрутом, прогрев заполняет его заново,
+    так что замеряется установившийся режим. Из метрик PerformanceMiddleware
+    в результат попадают медианы числа SQL-запросов и времени шаблонов.
+    """
+    author = Client()
+    author.force_login(benchmark.dataset.author)
+    cookie = (
+        f'{settings.SESSION_COOKIE_NAME}='
+        f'{author.cookies[settings.SESSION_COOKIE_NAME].value}'
+    )
+
+    with serve_wsgi() as address:
+        for name, url in iter_routes(benchmark.dataset):
+            authenticated = name in AUTHENTICATED_ROUTES
+            # Гость у каждого маршрута свой: сброс пароля заводит сессию,
+            # и другие маршруты не должны платить за её загрузку.
+            client = author if authenticated else Client()
+            transports = {
+                'client': (
+                    partial(client_get, client, url),
+                    1,
+                ),
+                'wsgi': (
+                    partial(http_get, address, url,
+                            cookie if authenticated else None),
+                    benchmark.concurrency,
+                ),
+            }
+            for transport, (func, concurrency) in transports.items():
+                status = func()
+                if status >= 400:
+                    raise BenchmarkError(
+                        f'{name} ({transport}) ответил {status}.'
+                    )
+                cache.clear()
+                perf.stats.reset()
+                result = benchmark.measure(
+                    'routes', f'{name} ({transport})', func, concurrency
+                )
+                result['status'] = status
+                view_stats = perf.stats.snapshot().get(name, {})
+                for metric in ('sql_count', 'template_ms'):
+                    if metric in view_stats:
+                        result[metric] = view_stats[metric]['p50']
@@ -0,0 +1,89 @@
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections, router, transaction
+
+
+def estimate_count(model):
+    """Оценка числа строк в таблице по статистике СУБД, без COUNT(*)."""
+    alias = router.db_for_read(model)
+    connection = connections[alias]
+    table = model._meta.db_table
+
+    if connection.vendor == 'sqlite':
+        # Заполняется командой ANALYZE; первое число — строки таблицы.
+        sql = 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1'
+    elif connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s'
+    else:
+        return None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None:
+        return None
+
+    try:
+        estimate = int(str(row[0]).split()[0])
+    except (IndexError, ValueError):
+        return None
+    return estimate if estimate >= 0 else None
+
+
+def count_rows(queryset, estimate_threshold):
+    """Число строк выборки; для нефильтрованной большой таблицы — оценка."""
+    if not queryset.query.has_filters():
+        estimate = estimate_count(queryset.model)
+        if estimate is not None and estimate >= estimate_threshold:
+            return estimate
+    return queryset.count()
+
+
+def backfill(queryset, update, fields, batch_size=1000, pause=0):
+    """
+    Обновляет поля fields у объектов выборки пачками по batch_size.
+
+    Пачки выбираются по pk, без OFFSET, и каждая читается и записывается
+    в своей транзакции, поэтому SQLite не блокируется на запись на всё
+    время обработки большой таблицы; pause — пауза в секундах между
+    пачками. update(obj) меняет объект; если она вернула False, объект
+    не записывается. Внутри чужой транзакции пачки становятся её
+    частью, поэтому в миграции нужно указать atomic = False.
+
+    Возвращает число записанных объектов.
+    """
+    using = queryset.db
+    manager = queryset.model._base_manager.db_manager(using)
+    queryset = queryset.order_by('pk')
+    written = 0
+    last_pk = None
+    while True:
+        with transaction.atomic(using=using, savepoint=False):
+            batch = queryset
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            batch = list(batch[:batch_size])
+            changed = [obj for obj in batch if update(obj) is not False]
+            if changed:
+                manager.bulk_update(changed, fields)
+        written += len(changed)
+        if len(batch) < batch_size:
+            return written
+        last_pk = batch[-1].pk
+        if pause:
+            time.sleep(pause)
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = settings.SQLITE_PRAGMAS
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
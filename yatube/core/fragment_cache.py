@@ -0,0 +1,120 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Фрагменты зависят от «поколений» пространств имён: при изменении данных
+# поколение увеличивается, и старые ключи просто перестают читаться.
+GENERATION_KEY = 'fragments:generation:{}'
+FRAGMENT_KEY = 'fragments:{}:{}:{}'
+
+
+class FragmentCacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def snapshot(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+        }
+
+
+stats = FragmentCacheStats()
+
+
+def _now():
+    return int(time.time() * 1000)
+
+
+def get_generations(namespaces):
+    keys = [GENERATION_KEY.format(namespace) for namespace in namespaces]
+    generations = cache.get_many(keys)
+    missing = {key: _now() for key in keys if key not in generations}
+    if missing:
+        # Начальное поколение — текущее время, чтобы после вытеснения
+        # ключа из кеша не вернуться к уже использованному номеру.
+        for key, generation in missing.items():
+            cache.add(key, generation, None)
+        generations.update(cache.get_many(missing))
+    return [generations.get(key, 0) for key in keys]
+
+
+def bump(*namespaces):
+    keys = [GENERATION_KEY.format(namespace) for namespace in namespaces]
+    current = cache.get_many(keys)
+    now = _now()
+    cache.set_many(
+        {key: max(now, current.get(key, 0) + 1) for key in keys}, None
+    )
+
+
+def auth_state(user):
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return 'anon'
+
+
+def _hash(parts):
+    return hashlib.md5(':'.join(str(part) for part in parts).encode())
+
+
+def get_etag(namespaces, vary_on=()):
+    """ETag страницы, собранной из этих пространств имён.
+
+    Last-Modified по поколениям не отдаётся: у него секундная точность,
+    и он не учитывает vary_on — пользователя и страницу.
+    """
+    generations = get_generations(namespaces)
+    return _hash((*namespaces, *generations, *vary_on)).hexdigest()
+
+
+def make_key(name, namespaces, vary_on=()):
+    generations = '.'.join(str(gen) for gen in get_generations(namespaces))
+    vary_hash = _hash((*namespaces, *vary_on)).hexdigest()
+    return FRAGMENT_KEY.format(name, generations, vary_hash)
+
+
+def get_fragment(key):
+    value = cache.get(key)
+    stats.record(value is not None)
+    return value
+
+
+def set_fragment(key, value):
+    cache.set(key, value, settings.FRAGMENT_CACHE_TIMEOUT)
+
+
+def get_or_render(name, namespaces, user, vary_on, render):
+    """Фрагмент из кеша или результат render(), который сохраняется в кеш.
+
+    Общая часть тегов cache_fragment шаблонов Django и Jinja2.
+    """
+    if isinstance(namespaces, str):
+        namespaces = [namespaces]
+    key = make_key(name, namespaces or (), [auth_state(user), *vary_on])
+    value = get_fragment(key)
+    if value is None:
+        value = render()
+        set_fragment(key, value)
+    return value
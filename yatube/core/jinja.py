@@ -0,0 +1,98 @@
+"""
+Окружение Jinja2 для шаблонов из каталога jinja2.
+
+Шаблоны Jinja2 включаются настройкой POSTS_TEMPLATE_ENGINE = 'jinja2'
+(см. yatube/settings/base.py) и повторяют шаблоны Django: в окружении
+есть url(), static(), фильтры date и truncatechars, elided_page_range()
+и тег cache_fragment с тем же кешем фрагментов, что и у шаблонов Django.
+"""
+import time
+
+from django.template.backends.jinja2 import Jinja2, Template
+from django.template.defaultfilters import date, truncatechars
+from django.templatetags.static import static
+from django.utils.timezone import template_localtime
+from jinja2 import Environment, nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from . import fragment_cache, perf
+from .routes import fast_reverse
+from .templatetags.pagination import elided_page_range
+
+
+def local_date(value, arg=None):
+    # Как фильтр date шаблонов Django: дата в текущем часовом поясе.
+    return date(template_localtime(value), arg)
+
+
+class FragmentCacheExtension(Extension):
+    """
+    {% cache_fragment name, namespaces[, vary_on, ...] %}
+    ...
+    {% endcache_fragment %}
+    """
+
+    tags = {'cache_fragment'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(
+            ['name:endcache_fragment'], drop_needle=True
+        )
+        call = self.call_method(
+            '_render', [nodes.ContextReference(), nodes.List(args)]
+        )
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, context, args, caller):
+        name, namespaces, *vary_on = args
+        # Разметка движков отличается, поэтому и ключи фрагментов свои.
+        return Markup(fragment_cache.get_or_render(
+            f'jinja2:{name}',
+            namespaces,
+            context.get('user'),
+            vary_on,
+            lambda: str(caller()),
+        ))
+
+
+def environment(**options):
+    options.setdefault('extensions', []).append(FragmentCacheExtension)
+    env = Environment(**options)
+    env.globals.update(
+        url=fast_reverse,
+        static=static,
+        elided_page_range=elided_page_range,
+    )
+    env.filters.update(
+        date=local_date,
+        truncatechars=truncatechars,
+    )
+    return env
+
+
+class InstrumentedJinja2Template(Template):
+    def render(self, context=None, request=None):
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics = perf.get_current()
+            if metrics is not None:
+                metrics.template_time += time.perf_counter() - started
+
+
+class InstrumentedJinja2(Jinja2):
+    """Бэкенд Jinja2, который учитывает время рендеринга в метриках запроса."""
+
+    def from_string(self, template_code):
+        template = super().from_string(template_code)
+        return InstrumentedJinja2Template(template.template, self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return InstrumentedJinja2Template(template.template, self)
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Все кеши процесса по именам, для статистики в perf_stats.
+caches = {}
+
+
+class LRUCache:
+    """
+    Ограниченный кеш в памяти процесса со сроком жизни записей.
+
+    Когда записей больше max_size, вытесняется та, к которой дольше всего
+    не обращались. Кеш у каждого процесса свой: сброс по сигналам виден
+    только в процессе, где изменили данные, в остальных запись доживает
+    до конца timeout, поэтому он должен быть коротким.
+    """
+
+    def __init__(self, name, max_size=1000, timeout=60):
+        self.name = name
+        self.max_size = max_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.reset_stats()
+        caches[name] = self
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires, value = item
+                if expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        with self._lock:
+            self._data[key] = (time.monotonic() + timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_matching(self, predicate):
+        """Удаляет записи, для которых predicate(key, value) истинно."""
+        with self._lock:
+            keys = [
+                key for key, (_, value) in self._data.items()
+                if predicate(key, value)
+            ]
+            for key in keys:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def snapshot(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            result = {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': hits,
+                'misses': misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+        total = hits + misses
+        result['hit_rate'] = hits / total if total else 0.0
+        return result
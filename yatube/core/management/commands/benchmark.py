@@ -0,0 +1,154 @@
+import json
+import platform
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import autodiscover_modules
+
+from core.benchmark import (SUITES, Benchmark, BenchmarkError,
+                            benchmark_database, compare, seed_database)
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет временную базу и замеряет задержку и пропускную '
+        'способность маршрутов сайта.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--suite',
+            action='append',
+            help='Набор замеров; можно указать несколько. '
+                 'По умолчанию запускаются все.',
+        )
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора данных: одно зерно — одна и та же база.',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Количество замеров на каждый случай.',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=5,
+            help='Количество запросов перед замерами.',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Количество параллельных клиентов WSGI-сервера.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл, в который сохраняются результаты в JSON.',
+        )
+        parser.add_argument(
+            '--compare',
+            help='Файл с результатами базового прогона.',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.2,
+            help='Допустимый относительный рост p50 при сравнении.',
+        )
+
+    def handle(self, *args, **options):
+        autodiscover_modules('benchmarks')
+        names = options['suite'] or sorted(SUITES)
+        unknown = set(names) - set(SUITES)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные наборы: {", ".join(sorted(unknown))}. '
+                f'Доступны: {", ".join(sorted(SUITES))}.'
+            )
+        if min(options['requests'], options['concurrency']) < 1:
+            raise CommandError(
+                '--requests и --concurrency должны быть больше нуля.'
+            )
+        baseline = self.load_baseline(options['compare'])
+
+        try:
+            results = self.run(names, options)
+        except BenchmarkError as error:
+            raise CommandError(error)
+        self.write_results(results)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as stream:
+                json.dump(results, stream, ensure_ascii=False, indent=2)
+        if baseline is not None:
+            self.check_regressions(baseline, results, options['threshold'])
+
+    def load_baseline(self, path):
+        if not path:
+            return None
+        try:
+            with open(path, encoding='utf-8') as stream:
+                return json.load(stream)
+        except (OSError, ValueError) as error:
+            raise CommandError(
+                f'Не удалось прочитать базовый прогон: {error}'
+            )
+
+    def run(self, names, options):
+        with benchmark_database() as connection:
+            dataset = seed_database(
+                users=options['users'],
+                groups=options['groups'],
+                posts=options['posts'],
+                seed=options['seed'],
+            )
+            benchmark = Benchmark(
+                dataset,
+                requests=options['requests'],
+                warmup=options['warmup'],
+                concurrency=options['concurrency'],
+            )
+            for name in names:
+                self.stderr.write(f'Набор {name}…')
+                SUITES[name](benchmark)
+            results = benchmark.as_dict()
+            results['meta'].update(
+                python=platform.python_version(),
+                django=django.get_version(),
+                database=connection.vendor,
+            )
+        return results
+
+    def check_regressions(self, baseline, results, threshold):
+        regressions = compare(baseline, results, threshold)
+        for suite_name, case, metric, before, after in regressions:
+            self.stdout.write(self.style.ERROR(
+                f'{suite_name} {case}: {metric} {before} → {after}'
+            ))
+        if regressions:
+            raise CommandError(f'Найдено регрессий: {len(regressions)}.')
+        self.stdout.write(self.style.SUCCESS('Регрессий нет.'))
+
+    def write_results(self, results):
+        for suite_name, cases in results['suites'].items():
+            self.stdout.write(self.style.MIGRATE_HEADING(suite_name))
+            width = max(len(case) for case in cases)
+            for case, result in cases.items():
+                line = (
+                    f'  {case:<{width}}  '
+                    f'p50 {result["p50"]:8.2f}  p90 {result["p90"]:8.2f}  '
+                    f'p99 {result["p99"]:8.2f} мс  {result["rps"]:8.1f} rps'
+                )
+                if 'sql_count' in result:
+                    line += f'  SQL {result["sql_count"]:g}'
+                if 'peak_kb' in result:
+                    line += f'  {result["peak_kb"]:g} КиБ'
+                self.stdout.write(line)
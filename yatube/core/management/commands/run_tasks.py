@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.tasks import get_queue
+
+
+class Command(BaseCommand):
+    help = 'Разбирает очередь фоновых задач, хранящуюся на диске.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        queue = get_queue()
+        if not hasattr(queue, 'work'):
+            raise CommandError(
+                f'{type(queue).__name__} выполняет задачи сам, '
+                'отдельный обработчик ему не нужен.'
+            )
+        try:
+            queue.work(burst=options['burst'])
+        except KeyboardInterrupt:
+            pass
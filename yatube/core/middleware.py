@@ -0,0 +1,52 @@
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import perf
+
+
+class PerformanceMiddleware:
+    """Замеряет время запроса, SQL, рендеринг шаблонов и размер ответа.
+
+    Замеры копятся в core.perf.stats по имени view и при включённой
+    настройке PERF_SERVER_TIMING отдаются в заголовке Server-Timing.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = perf.RequestMetrics()
+        perf.set_current(metrics)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(
+                        connections[alias].execute_wrapper(metrics)
+                    )
+                response = self.get_response(request)
+        finally:
+            perf.set_current(None)
+
+        values = {
+            'total_ms': metrics.total_time * 1000,
+            'sql_ms': metrics.sql_time * 1000,
+            'sql_count': metrics.sql_count,
+            'template_ms': metrics.template_time * 1000,
+        }
+        if not response.streaming:
+            values['size_bytes'] = len(response.content)
+
+        match = request.resolver_match
+        view = match.view_name if match is not None else '<unresolved>'
+        perf.stats.record(view, values)
+
+        if settings.PERF_SERVER_TIMING:
+            response['Server-Timing'] = ', '.join([
+                f'total;dur={values["total_ms"]:.1f}',
+                f'sql;dur={values["sql_ms"]:.1f};'
+                f'desc="{metrics.sql_count} queries"',
+                f'tpl;dur={values["template_ms"]:.1f}',
+            ])
+        return response
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+METRICS = ('total_ms', 'sql_ms', 'sql_count', 'template_ms', 'size_bytes')
+PERCENTILES = (50, 90, 99)
+
+_local = threading.local()
+
+
+class RequestMetrics:
+    """Счётчики одного запроса; заполняются обёртками SQL и шаблонов."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Обёртка для connection.execute_wrapper().
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.sql_count += 1
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+
+def get_current():
+    return getattr(_local, 'metrics', None)
+
+
+def set_current(metrics):
+    _local.metrics = metrics
+
+
+def percentile(ordered, percent):
+    index = max(0, -(-len(ordered) * percent // 100) - 1)
+    return ordered[index]
+
+
+class PerfStats:
+    """Последние замеры по каждому view и их перцентили."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._requests = defaultdict(int)
+            self._samples = defaultdict(dict)
+
+    def record(self, view, values):
+        size = settings.PERF_SAMPLE_SIZE
+        with self._lock:
+            self._requests[view] += 1
+            samples = self._samples[view]
+            for metric, value in values.items():
+                if metric not in samples:
+                    samples[metric] = deque(maxlen=size)
+                samples[metric].append(value)
+
+    def snapshot(self):
+        with self._lock:
+            requests = dict(self._requests)
+            samples = {
+                view: {metric: sorted(values)
+                       for metric, values in metrics.items()}
+                for view, metrics in self._samples.items()
+            }
+
+        result = {}
+        for view, metrics in samples.items():
+            result[view] = {'requests': requests[view]}
+            for metric, ordered in metrics.items():
+                result[view][metric] = {
+                    **{
+                        f'p{percent}': round(percentile(ordered, percent), 3)
+                        for percent in PERCENTILES
+                    },
+                    'max': round(ordered[-1], 3),
+                }
+        return result
+
+
+stats = PerfStats()
+
+
+class InstrumentedTemplate(Template):
+    def render(self, context=None, request=None):
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics = get_current()
+            if metrics is not None:
+                metrics.template_time += time.perf_counter() - started
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Бэкенд DTL, который учитывает время рендеринга в метриках запроса.
+
+    Оборачивается только шаблон верхнего уровня, поэтому include и
+    extends не считаются повторно.
+    """
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(
+            self.engine.from_string(template_code), self
+        )
+
+    def get_template(self, template_name):
+        try:
+            return InstrumentedTemplate(
+                self.engine.get_template(template_name), self
+            )
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
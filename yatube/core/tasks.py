@@ -0,0 +1,250 @@
+"""
+Фоновые задачи.
+
+Функция, помеченная декоратором task, ставится в очередь вызовом
+enqueue() или enqueue_on_commit(). Очередь задаётся настройкой TASKS:
+
+* ThreadPoolBackend — пул потоков в процессе веб-сервера;
+* SQLiteBackend — очередь в отдельном файле SQLite, которую разбирают
+  процессы ``manage.py run_tasks``; задачи переживают перезапуск;
+* ImmediateBackend — выполняет задачу сразу, в том же потоке.
+
+Аргументы задач сериализуются в JSON во всех очередях, чтобы задачу
+можно было перенести в другую очередь без изменений.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections, connections, transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+class TaskError(Exception):
+    pass
+
+
+def task(func):
+    """Регистрирует функцию как фоновую задачу."""
+    func.task_name = f'{func.__module__}.{func.__qualname__}'
+    registry[func.task_name] = func
+    return func
+
+
+def get_queue():
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                config = settings.TASKS
+                backend = import_string(config['BACKEND'])
+                _queue = backend(**config.get('OPTIONS', {}))
+    return _queue
+
+
+@receiver(setting_changed)
+def reset_queue(setting, **kwargs):
+    global _queue
+    if setting == 'TASKS':
+        with _queue_lock:
+            if _queue is not None:
+                _queue.close()
+            _queue = None
+
+
+def _get_name(func):
+    name = getattr(func, 'task_name', None)
+    if name not in registry:
+        raise TaskError(f'{func!r} не зарегистрирована декоратором @task.')
+    return name
+
+
+def enqueue(func, *args, **kwargs):
+    get_queue().enqueue(_get_name(func), json.dumps([args, kwargs]))
+
+
+def enqueue_on_commit(func, *args, using=None, **kwargs):
+    """Ставит задачу в очередь после фиксации текущей транзакции.
+
+    Вне транзакции задача ставится сразу; при откате — отбрасывается.
+    """
+    name = _get_name(func)
+    payload = json.dumps([args, kwargs])
+    transaction.on_commit(
+        lambda: get_queue().enqueue(name, payload), using=using
+    )
+
+
+def run_task(name, payload):
+    """Выполняет задачу; возвращает False, если она завершилась ошибкой."""
+    func = registry.get(name)
+    if func is None:
+        logger.error('Неизвестная задача %s', name)
+        return False
+    args, kwargs = json.loads(payload)
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Ошибка в задаче %s', name)
+        return False
+    return True
+
+
+class ImmediateBackend:
+    def enqueue(self, name, payload):
+        run_task(name, payload)
+
+    def close(self):
+        pass
+
+
+class ThreadPoolBackend:
+    def __init__(self, max_workers=2):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='tasks'
+        )
+
+    def enqueue(self, name, payload):
+        self.executor.submit(self.run, name, payload)
+
+    def run(self, name, payload):
+        try:
+            run_task(name, payload)
+        finally:
+            # Соединения с базой у каждого потока свои.
+            connections.close_all()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+class SQLiteBackend:
+    """Очередь в файле SQLite, общая для веб-процессов и обработчиков.
+
+    Задача забирается обработчиком на время lease секунд; если он не
+    успел её закончить, задачу заберёт другой. Упавшая задача
+    повторяется через retry_delay * номер попытки секунд, после
+    max_attempts попыток остаётся в таблице с отметкой failed_at.
+    """
+
+    def __init__(self, path, lease=300, max_attempts=3, retry_delay=30,
+                 poll_interval=1.0):
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.local = threading.local()
+
+    @property
+    def connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS tasks ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'name TEXT NOT NULL, '
+                'payload TEXT NOT NULL, '
+                'attempts INTEGER NOT NULL DEFAULT 0, '
+                'available_at REAL NOT NULL, '
+                'failed_at REAL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS tasks_available_idx '
+                'ON tasks (available_at) WHERE failed_at IS NULL'
+            )
+            self.local.connection = connection
+        return connection
+
+    def enqueue(self, name, payload):
+        self.connection.execute(
+            'INSERT INTO tasks (name, payload, available_at) '
+            'VALUES (?, ?, ?)',
+            (name, payload, time.time()),
+        )
+
+    def claim(self):
+        connection = self.connection
+        now = time.time()
+        # BEGIN IMMEDIATE не даёт двум обработчикам забрать одну задачу.
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT id, name, payload, attempts FROM tasks '
+                'WHERE failed_at IS NULL AND available_at <= ? '
+                'ORDER BY available_at, id LIMIT 1',
+                (now,),
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    'UPDATE tasks SET attempts = attempts + 1, '
+                    'available_at = ? WHERE id = ?',
+                    (now + self.lease, row[0]),
+                )
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        return row
+
+    def finish(self, task_id, attempts, succeeded):
+        if succeeded:
+            self.connection.execute(
+                'DELETE FROM tasks WHERE id = ?', (task_id,)
+            )
+        elif attempts >= self.max_attempts:
+            self.connection.execute(
+                'UPDATE tasks SET failed_at = ? WHERE id = ?',
+                (time.time(), task_id),
+            )
+        else:
+            self.connection.execute(
+                'UPDATE tasks SET available_at = ? WHERE id = ?',
+                (time.time() + self.retry_delay * attempts, task_id),
+            )
+
+    def run_pending(self, limit=None):
+        """Выполняет готовые задачи; возвращает их количество."""
+        done = 0
+        while limit is None or done < limit:
+            row = self.claim()
+            if row is None:
+                break
+            task_id, name, payload, attempts = row
+            close_old_connections()
+            succeeded = run_task(name, payload)
+            close_old_connections()
+            self.finish(task_id, attempts + 1, succeeded)
+            done += 1
+        return done
+
+    def work(self, burst=False):
+        while True:
+            done = self.run_pending()
+            if burst:
+                return
+            if not done:
+                time.sleep(self.poll_interval)
+
+    def close(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
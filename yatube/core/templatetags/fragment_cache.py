@@ -0,0 +1,50 @@
+from django import template
+
+from core import fragment_cache
+
+register = template.Library()
+
+
+class CacheFragmentNode(template.Node):
+    def __init__(self, nodelist, name, namespaces, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.namespaces = namespaces
+        self.vary_on = vary_on
+
+    def render(self, context):
+        return fragment_cache.get_or_render(
+            self.name,
+            self.namespaces.resolve(context),
+            context.get('user'),
+            [
+                var.resolve(context, ignore_failures=True)
+                for var in self.vary_on
+            ],
+            lambda: self.nodelist.render(context),
+        )
+
+
+@register.tag('cache_fragment')
+def do_cache_fragment(parser, token):
+    """
+    Кеширует фрагмент шаблона до изменения данных пространств имён.
+
+    {% cache_fragment name namespaces [vary_on ...] %}
+    ...
+    {% endcache_fragment %}
+    """
+    nodelist = parser.parse(('endcache_fragment',))
+    parser.delete_first_token()
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' принимает как минимум два аргумента."
+        )
+    name = bits[1].strip('\'"')
+    return CacheFragmentNode(
+        nodelist,
+        name,
+        parser.compile_filter(bits[2]),
+        [parser.compile_filter(bit) for bit in bits[3:]],
+    )
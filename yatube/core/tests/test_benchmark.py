@@ -0,0 +1,118 @@
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import resolve
+
+from posts.models import AuthorStats, Group, Post
+
+from ..benchmark import (ROUTE_MODULES, compare, iter_routes, measure,
+                         seed_database, summarize)
+
+User = get_user_model()
+
+
+class SeedDatabaseTests(TestCase):
+    def seed(self):
+        dataset = seed_database(users=3, groups=2, posts=30, batch_size=7)
+        posts = list(
+            Post.objects.order_by('pk').values_list(
+                'text', 'author__username', 'group__slug'
+            )
+        )
+        return dataset, posts
+
+    def test_seed_fills_database(self):
+        """Посты создаются пачками с HTML и счётчиками авторов."""
+        dataset, posts = self.seed()
+
+        self.assertEqual(len(posts), 30)
+        self.assertEqual(Group.objects.count(), 2)
+        self.assertFalse(Post.objects.filter(render_version=0).exists())
+        self.assertEqual(
+            sum(AuthorStats.objects.values_list('posts_count', flat=True)),
+            30,
+        )
+        self.assertEqual(dataset.post.author, dataset.author)
+        self.assertEqual(dataset.sizes['posts'], 30)
+
+    def test_seed_is_reproducible(self):
+        """Одно зерно даёт одни и те же посты."""
+        _, first = self.seed()
+        User.objects.all().delete()
+        Group.objects.all().delete()
+
+        _, second = self.seed()
+
+        self.assertEqual(first, second)
+
+
+class RouteTests(TestCase):
+    def test_every_route_has_url(self):
+        """Каждый маршрут проверяемых приложений получает рабочий URL."""
+        dataset = seed_database(users=2, groups=2, posts=5)
+
+        routes = dict(iter_routes(dataset))
+
+        for module_name in ROUTE_MODULES:
+            app_name = module_name.split('.')[0]
+            self.assertTrue(any(
+                name.startswith(f'{app_name}:') for name in routes
+            ))
+        for name, url in routes.items():
+            with self.subTest(name=name):
+                self.assertEqual(
+                    resolve(url.split('?')[0]).view_name, name
+                )
+
+
+class CompareTests(SimpleTestCase):
+    def result(self, p50, sql_count=2):
+        return {'suites': {'routes': {
+            'posts:index (client)': {'p50': p50, 'sql_count': sql_count},
+        }}}
+
+    def test_slowdown_above_threshold_is_regression(self):
+        """Рост p50 выше порога и шума считается регрессией."""
+        regressions = compare(self.result(10.0), self.result(13.0), 0.2)
+
+        self.assertEqual(regressions, [
+            ('routes', 'posts:index (client)', 'p50', 10.0, 13.0),
+        ])
+
+    def test_small_slowdown_is_noise(self):
+        """Рост в пределах порога или шума не считается регрессией."""
+        self.assertEqual(compare(self.result(10.0), self.result(11.0)), [])
+        self.assertEqual(compare(self.result(0.5), self.result(0.9)), [])
+
+    def test_extra_queries_are_regression(self):
+        """Лишний SQL-запрос считается регрессией при любой задержке."""
+        regressions = compare(self.result(10.0), self.result(9.0, 3))
+
+        self.assertEqual(regressions, [
+            ('routes', 'posts:index (client)', 'sql_count', 2, 3),
+        ])
+
+    def test_new_cases_are_skipped(self):
+        """Случаи, которых нет в базовом прогоне, не сравниваются."""
+        self.assertEqual(compare({'suites': {}}, self.result(10.0)), [])
+
+
+class MeasureTests(SimpleTestCase):
+    def test_summary(self):
+        """Сводка содержит перцентили, среднее и запросы в секунду."""
+        summary = summarize([4.0, 1.0, 3.0, 2.0], elapsed=0.5)
+
+        self.assertEqual(summary['p50'], 2.0)
+        self.assertEqual(summary['p99'], 4.0)
+        self.assertEqual(summary['max'], 4.0)
+        self.assertEqual(summary['mean'], 2.5)
+        self.assertEqual(summary['rps'], 8.0)
+
+    def test_measure_calls_function(self):
+        """Функция вызывается на прогрев и на каждый замер."""
+        calls = []
+
+        summary = measure(lambda: calls.append(1), 6, warmup=2,
+                          concurrency=3)
+
+        self.assertEqual(len(calls), 8)
+        self.assertGreater(summary['rps'], 0)
@@ -0,0 +1,62 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from posts.models import Group
+
+from ..db import backfill, configure_sqlite
+
+
+class ConfigureSqliteTests(TestCase):
+    def get_pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    @override_settings(SQLITE_PRAGMAS={'cache_size': -4096})
+    def test_pragmas_applied_on_connection(self):
+        """PRAGMA из настроек выполняются на новом соединении."""
+        configure_sqlite(sender=None, connection=connection)
+
+        self.assertEqual(self.get_pragma('cache_size'), -4096)
+
+
+class BackfillTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Group.objects.bulk_create(
+            Group(title=f'Группа {i}', slug=f'group-{i}', description='')
+            for i in range(5)
+        )
+
+    def test_updates_in_batches(self):
+        """Пачки читаются по pk и записываются одним запросом каждая."""
+        def rename(group):
+            group.title = group.title.upper()
+
+        # Три чтения и три записи: две полные пачки и одна неполная.
+        with self.assertNumQueries(6):
+            written = backfill(
+                Group.objects.only('pk', 'title'), rename, ['title'],
+                batch_size=2,
+            )
+
+        self.assertEqual(written, 5)
+        self.assertEqual(
+            Group.objects.filter(title__startswith='ГРУППА').count(), 5
+        )
+
+    def test_skips_unchanged_objects(self):
+        """Объекты, для которых update вернула False, не записываются."""
+        def rename_odd(group):
+            if group.slug[-1] not in '13':
+                return False
+            group.slug += '-odd'
+
+        written = backfill(Group.objects.all(), rename_odd, ['slug'])
+
+        self.assertEqual(written, 2)
+        self.assertEqual(
+            set(Group.objects.filter(slug__endswith='-odd')
+                .values_list('slug', flat=True)),
+            {'group-1-odd', 'group-3-odd'},
+        )
@@ -0,0 +1,86 @@
+import re
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+try:
+    import jinja2
+except ImportError:
+    jinja2 = None
+
+User = get_user_model()
+
+BOTH_ENGINES = [*settings.TEMPLATES[:1], settings.JINJA2_TEMPLATES]
+
+
+def normalize(content):
+    return re.sub(r'\s+', ' ', content.decode()).strip()
+
+
+@skipUnless(jinja2, 'Jinja2 не установлен')
+@override_settings(TEMPLATES=BOTH_ENGINES)
+class JinjaTemplatesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='test_user', first_name='Иван', last_name='Петров'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(13):
+            Post.objects.create(
+                author=cls.user, group=cls.group, text=f'Пост №{i}\nстрока'
+            )
+        cls.post = Post.objects.latest('pk')
+
+    def setUp(self):
+        self.auth_client = Client()
+        self.auth_client.force_login(JinjaTemplatesTests.user)
+
+    def get(self, client, url, engine):
+        cache.clear()
+        with self.settings(POSTS_TEMPLATE_ENGINE=engine):
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        # Тестовый клиент видит только шаблоны Django.
+        self.assertEqual(bool(response.templates), engine == 'django')
+        return normalize(response.content)
+
+    def test_pages_match_django_templates(self):
+        """Страницы на Jinja2 совпадают со страницами на шаблонах Django."""
+        urls = [
+            reverse('posts:index'),
+            reverse('posts:index') + '?page=2',
+            reverse('posts:group_posts', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': 'test_user'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        ]
+        for client in (Client(), self.auth_client):
+            for url in urls:
+                with self.subTest(url=url, client=client):
+                    self.assertEqual(
+                        self.get(client, url, 'jinja2'),
+                        self.get(client, url, 'django'),
+                    )
+
+    def test_feed_fragment_cached(self):
+        """Лента на Jinja2 берётся из кеша фрагментов."""
+        url = reverse('posts:index')
+        self.get(Client(), url, 'jinja2')
+        Post.objects.filter(pk=self.post.pk).update(
+            excerpt_html='Изменённый анонс'
+        )
+
+        with self.settings(POSTS_TEMPLATE_ENGINE='jinja2'):
+            response = Client().get(url)
+
+        self.assertNotContains(response, 'Изменённый анонс')
@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..lru import LRUCache, caches
+
+
+class LRUCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = LRUCache('test', max_size=2, timeout=10)
+
+    def tearDown(self):
+        caches.pop('test', None)
+
+    def test_least_recently_used_is_evicted(self):
+        """При переполнении вытесняется запись, которую дольше не читали."""
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('c'), 3)
+        self.assertEqual(self.cache.snapshot()['evictions'], 1)
+
+    def test_expired_entry_is_miss(self):
+        """Запись со сроком жизни timeout читается до его окончания."""
+        with mock.patch('core.lru.time.monotonic', return_value=100):
+            self.cache.set('a', 1)
+            self.cache.set('b', 2, timeout=60)
+        with mock.patch('core.lru.time.monotonic', return_value=111):
+            self.assertIsNone(self.cache.get('a'))
+            self.assertEqual(self.cache.get('b'), 2)
+
+        stats = self.cache.snapshot()
+        self.assertEqual(stats['expirations'], 1)
+        self.assertEqual(stats['size'], 1)
+
+    def test_stats(self):
+        """Статистика считает попадания и промахи."""
+        self.cache.set('a', None)
+
+        self.assertIsNone(self.cache.get('a', 'default'))
+        self.assertEqual(self.cache.get('b', 'default'), 'default')
+
+        stats = self.cache.snapshot()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+        self.assertIs(caches['test'], self.cache)
+
+    def test_delete_matching(self):
+        """Записи удаляются по условию на ключ и значение."""
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+
+        self.cache.delete_matching(lambda key, value: value == 2)
+
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.get('a'), 1)
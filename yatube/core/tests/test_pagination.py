@@ -0,0 +1,48 @@
+from django.core.paginator import Paginator
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+from ..templatetags.pagination import elided_page_range
+
+
+class ElidedPageRangeTests(SimpleTestCase):
+    def get_page(self, number, num_pages):
+        return Paginator(range(num_pages), 1).page(number)
+
+    def test_short_range_is_not_elided(self):
+        """Небольшое число страниц выводится полностью."""
+        self.assertEqual(
+            elided_page_range(self.get_page(3, 7)),
+            [1, 2, 3, 4, 5, 6, 7]
+        )
+
+    def test_long_range_is_elided(self):
+        """Длинный список страниц сокращается вокруг текущей страницы."""
+        expected = {
+            1: [1, 2, 3, None, 20000],
+            5: [1, 2, 3, 4, 5, 6, 7, None, 20000],
+            100: [1, None, 98, 99, 100, 101, 102, None, 20000],
+            19996: [1, None, 19994, 19995, 19996, 19997, 19998, 19999, 20000],
+            20000: [1, None, 19998, 19999, 20000],
+        }
+
+        for number, pages in expected.items():
+            with self.subTest(number=number):
+                self.assertEqual(
+                    elided_page_range(self.get_page(number, 20000)),
+                    pages
+                )
+
+    def test_template_tag_renders_bounded_window(self):
+        """Тег шаблона выдаёт ограниченное число ссылок."""
+        template = Template(
+            '{% load pagination %}'
+            '{% elided_page_range page_obj as pages %}'
+            '{% for i in pages %}[{{ i|default:"…" }}]{% endfor %}'
+        )
+
+        output = template.render(
+            Context({'page_obj': self.get_page(50, 20000)})
+        )
+
+        self.assertEqual(output, '[1][…][48][49][50][51][52][…][20000]')
@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import perf
+
+User = get_user_model()
+
+
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self):
+        perf.stats.reset()
+        self.guest_client = Client()
+
+    @override_settings(PERF_SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        """Ответ содержит время запроса, SQL и шаблонов."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.guest_client.get(reverse('about:author'))
+
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'^total;dur=[\d.]+, sql;dur=[\d.]+;')
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        self.assertRegex(timing, r'tpl;dur=[\d.]+$')
+
+    @override_settings(PERF_SERVER_TIMING=False)
+    def test_server_timing_can_be_disabled(self):
+        """Заголовок Server-Timing отключается настройкой."""
+        response = self.guest_client.get(reverse('about:author'))
+
+        self.assertNotIn('Server-Timing', response)
+
+    def test_metrics_aggregated_per_view(self):
+        """Замеры копятся по имени view вместе с перцентилями."""
+        for _ in range(3):
+            response = self.guest_client.get(reverse('posts:index'))
+
+        view_stats = perf.stats.snapshot()['posts:index']
+        self.assertEqual(view_stats['requests'], 3)
+        self.assertEqual(
+            set(view_stats), {'requests', *perf.METRICS}
+        )
+        self.assertEqual(
+            view_stats['size_bytes']['max'], len(response.content)
+        )
+        self.assertGreater(view_stats['template_ms']['p50'], 0)
+        self.assertGreater(view_stats['sql_count']['max'], 0)
+
+    def test_percentile(self):
+        """Перцентиль считается методом ближайшего ранга."""
+        ordered = list(range(1, 101))
+
+        self.assertEqual(perf.percentile(ordered, 50), 50)
+        self.assertEqual(perf.percentile(ordered, 99), 99)
+        self.assertEqual(perf.percentile([7], 90), 7)
+
+
+class PerfStatsViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.staff = User.objects.create_user(
+            username='staff', is_staff=True
+        )
+        cls.user = User.objects.create_user(username='test_user')
+
+    def setUp(self):
+        perf.stats.reset()
+        self.staff_client = Client()
+        self.auth_client = Client()
+
+        self.staff_client.force_login(PerfStatsViewTests.staff)
+        self.auth_client.force_login(PerfStatsViewTests.user)
+
+    def test_only_staff_can_see_stats(self):
+        """Статистику видят только сотрудники."""
+        url = reverse('perf_stats')
+
+        for client in (Client(), self.auth_client):
+            with self.subTest(client=client):
+                response = client.get(url)
+                self.assertEqual(response.status_code, 302)
+                self.assertIn(reverse('admin:login'), response.url)
+
+    def test_stats_dump(self):
+        """Статистика отдаётся в JSON и сбрасывается POST-запросом."""
+        url = reverse('perf_stats')
+        self.staff_client.get(reverse('about:tech'))
+
+        data = self.staff_client.get(url).json()
+        self.assertIn('about:tech', data['views'])
+        self.assertIn('hit_rate', data['fragment_cache'])
+        self.assertIn('evictions', data['lru_caches']['posts:groups'])
+
+        self.staff_client.post(url, {'reset': '1'})
+        self.assertNotIn('about:tech', perf.stats.snapshot())
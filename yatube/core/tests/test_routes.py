@@ -0,0 +1,59 @@
+from django.test import SimpleTestCase
+from django.urls import NoReverseMatch, reverse, set_script_prefix
+
+from ..routes import compile_route, fast_reverse
+
+
+class FastReverseTests(SimpleTestCase):
+    def tearDown(self):
+        set_script_prefix('/')
+
+    def test_matches_reverse(self):
+        """Адреса совпадают с reverse(), в том числе с кодированием."""
+        cases = [
+            ('posts:index', (), {}),
+            ('about:tech', (), {}),
+            ('login', (), {}),
+            ('posts:post_detail', (7,), {}),
+            ('posts:post_edit', (), {'post_id': 7}),
+            ('posts:group_posts', (), {'slug': 'cats-2'}),
+            ('posts:profile', (), {'username': 'юзер+1@mail'}),
+        ]
+        for viewname, args, kwargs in cases:
+            with self.subTest(viewname=viewname):
+                self.assertEqual(
+                    fast_reverse(viewname, *args, **kwargs),
+                    reverse(viewname, args=args, kwargs=kwargs),
+                )
+
+    def test_script_prefix(self):
+        """Префикс SCRIPT_NAME читается при каждом вызове."""
+        fast_reverse('posts:post_detail', post_id=1)
+        set_script_prefix('/yatube/')
+
+        self.assertEqual(
+            fast_reverse('posts:post_detail', post_id=1), '/yatube/posts/1/'
+        )
+
+    def test_invalid_values_raise_like_reverse(self):
+        """Неподходящие значения и аргументы не дают адреса."""
+        cases = [
+            ('posts:group_posts', (), {'slug': 'a b'}),
+            ('posts:post_detail', (), {'post_id': 'abc'}),
+            ('posts:post_detail', (), {'pk': 1}),
+            ('posts:post_detail', (1, 2), {}),
+            ('posts:missing', (), {}),
+            ('missing:index', (), {}),
+        ]
+        for viewname, args, kwargs in cases:
+            with self.subTest(viewname=viewname, args=args, kwargs=kwargs):
+                with self.assertRaises(NoReverseMatch):
+                    fast_reverse(viewname, *args, **kwargs)
+
+    def test_route_is_compiled_once(self):
+        compile_route.cache_clear()
+        for post_id in range(3):
+            fast_reverse('posts:post_detail', post_id=post_id)
+
+        info = compile_route.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
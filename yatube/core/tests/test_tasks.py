@@ -0,0 +1,149 @@
+import os
+import tempfile
+import threading
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from .. import tasks
+
+calls = []
+finished = threading.Event()
+
+
+@tasks.task
+def record(value, suffix=''):
+    calls.append(f'{value}{suffix}')
+    finished.set()
+
+
+@tasks.task
+def fail():
+    calls.append('fail')
+    raise RuntimeError('Ошибка задачи')
+
+
+def not_a_task():
+    pass
+
+
+class TaskTestMixin:
+    def setUp(self):
+        calls.clear()
+        finished.clear()
+
+
+@override_settings(TASKS={'BACKEND': 'core.tasks.ImmediateBackend'})
+class EnqueueTests(TaskTestMixin, SimpleTestCase):
+    def test_enqueue_runs_registered_task(self):
+        """Задача выполняется с переданными аргументами."""
+        tasks.enqueue(record, 'пост', suffix='!')
+
+        self.assertEqual(calls, ['пост!'])
+
+    def test_unregistered_function_is_rejected(self):
+        """Функцию без декоратора @task нельзя поставить в очередь."""
+        with self.assertRaises(tasks.TaskError):
+            tasks.enqueue(not_a_task)
+
+    def test_failing_task_is_logged(self):
+        """Ошибка задачи не выходит за пределы очереди."""
+        with self.assertLogs('core.tasks', 'ERROR'):
+            tasks.enqueue(fail)
+
+        self.assertEqual(calls, ['fail'])
+
+
+@override_settings(TASKS={'BACKEND': 'core.tasks.ImmediateBackend'})
+class EnqueueOnCommitTests(TaskTestMixin, TransactionTestCase):
+    def test_task_runs_after_commit(self):
+        """Задача ставится в очередь только после фиксации транзакции."""
+        with transaction.atomic():
+            tasks.enqueue_on_commit(record, 'пост')
+            self.assertEqual(calls, [])
+
+        self.assertEqual(calls, ['пост'])
+
+    def test_task_dropped_on_rollback(self):
+        """При откате транзакции задача не выполняется."""
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                tasks.enqueue_on_commit(record, 'пост')
+                raise ValueError
+
+        self.assertEqual(calls, [])
+
+
+@override_settings(TASKS={
+    'BACKEND': 'core.tasks.ThreadPoolBackend',
+    'OPTIONS': {'max_workers': 1},
+})
+class ThreadPoolBackendTests(TaskTestMixin, SimpleTestCase):
+    def test_task_runs_in_background_thread(self):
+        """Пул потоков выполняет задачу вне вызывающего потока."""
+        tasks.enqueue(record, 'пост')
+
+        self.assertTrue(finished.wait(5))
+        self.assertEqual(calls, ['пост'])
+
+
+class SQLiteBackendTests(TaskTestMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'tasks.sqlite3')
+        settings = override_settings(TASKS={
+            'BACKEND': 'core.tasks.SQLiteBackend',
+            'OPTIONS': {'path': self.path, 'retry_delay': 0},
+        })
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def make_backend(self):
+        backend = tasks.SQLiteBackend(self.path, retry_delay=0)
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_tasks_survive_until_worker_runs_them(self):
+        """Задачи хранятся в файле, пока их не выполнит обработчик."""
+        tasks.enqueue(record, 'первый')
+        tasks.enqueue(record, 'второй')
+        self.assertEqual(calls, [])
+
+        worker = self.make_backend()
+        self.assertEqual(worker.run_pending(), 2)
+        self.assertEqual(calls, ['первый', 'второй'])
+        self.assertEqual(worker.run_pending(), 0)
+
+    def test_claimed_task_is_not_given_to_another_worker(self):
+        """Забранная задача не достаётся второму обработчику."""
+        tasks.enqueue(record, 'пост')
+
+        self.assertIsNotNone(self.make_backend().claim())
+        self.assertIsNone(self.make_backend().claim())
+
+    def test_failed_task_is_retried_then_kept(self):
+        """Упавшая задача повторяется и после всех попыток остаётся."""
+        tasks.enqueue(fail)
+        worker = self.make_backend()
+
+        with self.assertLogs('core.tasks', 'ERROR'):
+            for _ in range(worker.max_attempts + 1):
+                worker.run_pending()
+
+        self.assertEqual(calls, ['fail'] * worker.max_attempts)
+        failed = worker.connection.execute(
+            'SELECT COUNT(*) FROM tasks WHERE failed_at IS NOT NULL'
+        ).fetchone()[0]
+        self.assertEqual(failed, 1)
+
+    def test_run_tasks_command_in_burst_mode(self):
+        """Команда run_tasks --burst выполняет готовые задачи."""
+        tasks.enqueue(record, 'пост')
+
+        call_command('run_tasks', burst=True, stdout=StringIO())
+
+        self.assertEqual(calls, ['пост'])
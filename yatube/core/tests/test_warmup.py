@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+from ..warmup import iter_template_names, warm_templates
+
+CACHED_TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [settings.TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+class WarmTemplatesTests(SimpleTestCase):
+    def test_warm_templates_compiles_every_template(self):
+        """Прогрев компилирует все шаблоны проекта в кеш загрузчика."""
+        names = list(iter_template_names(settings.TEMPLATES_DIR))
+
+        compiled = warm_templates()
+
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertIn('posts/index.html', names)
+        self.assertIn('posts/includes/paginator.html', names)
+        self.assertEqual(compiled, len(names))
+        self.assertTrue(set(names) <= set(loader.get_template_cache))
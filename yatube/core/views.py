@@ -0,0 +1,20 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from . import fragment_cache, lru, perf
+
+
+@staff_member_required
+def perf_stats(request):
+    if request.method == 'POST' and 'reset' in request.POST:
+        perf.stats.reset()
+        fragment_cache.stats.reset()
+        for cache in lru.caches.values():
+            cache.reset_stats()
+    return JsonResponse({
+        'views': perf.stats.snapshot(),
+        'fragment_cache': fragment_cache.stats.snapshot(),
+        'lru_caches': {
+            name: cache.snapshot() for name, cache in lru.caches.items()
+        },
+    }, json_dumps_params={'ensure_ascii': False, 'indent': 2})
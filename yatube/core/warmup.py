@@ -0,0 +1,38 @@
+import logging
+import os
+
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+
+def iter_template_names(directory):
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            if filename.endswith('.html'):
+                path = os.path.join(root, filename)
+                yield os.path.relpath(path, directory).replace(os.sep, '/')
+
+
+def warm_templates():
+    """
+    Компилирует все шаблоны из DIRS движков Django при старте процесса.
+
+    С кеширующим загрузчиком скомпилированные шаблоны остаются в памяти,
+    и первый запрос в воркере не тратит время на разбор шаблонов.
+    """
+    compiled = 0
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for directory in engine.engine.dirs:
+            for name in iter_template_names(directory):
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError:
+                    logger.exception('Не удалось скомпилировать %s', name)
+                else:
+                    compiled += 1
+    logger.info('Скомпилировано шаблонов: %d', compiled)
+    return compiled
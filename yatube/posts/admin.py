@@ -1,6 +1,76 @@
+import datetime as dt
+
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.db.models import Max, Min
+from django.forms import BaseModelFormSet
+from django.utils import timezone
 
 from .models import Group, Post
+from .paginators import EstimatedCountPaginator
+
+
+class LoadedGroupSelect(AutocompleteSelect):
+    """Автодополнение группы, которое подписывает выбранное значение
+    уже загруженной группой поста, без запроса на каждую строку."""
+
+    loaded = None
+
+    def optgroups(self, name, value, attr=None):
+        group = self.loaded
+        if group is None or [str(v) for v in value] != [str(group.pk)]:
+            return super().optgroups(name, value, attr)
+        options = [
+            self.create_option(name, group.pk, str(group), True, 1)
+        ]
+        if not self.is_required:
+            options.insert(0, self.create_option(name, '', '', False, 0))
+        return [(None, options, 0)]
+
+
+class PostChangeListFormSet(BaseModelFormSet):
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        widget = form.fields['group'].widget
+        # Поле обёрнуто в RelatedFieldWidgetWrapper со ссылками «добавить».
+        widget = getattr(widget, 'widget', widget)
+        if isinstance(widget, LoadedGroupSelect):
+            widget.loaded = form.instance.group
+
+
+class PubDateYearFilter(admin.SimpleListFilter):
+    """Фильтр по году публикации вместо date_hierarchy.
+
+    date_hierarchy без выбранной даты собирает годы через SELECT DISTINCT
+    по всей таблице, а этому фильтру хватает MIN и MAX по индексу
+    pub_date.
+    """
+
+    title = 'год публикации'
+    parameter_name = 'year'
+
+    def lookups(self, request, model_admin):
+        queryset = model_admin.get_queryset(request)
+        # Отдельными запросами: MIN и MAX в одном SELECT SQLite считает
+        # обходом всего индекса, а по одному — поиском по нему.
+        first = queryset.aggregate(value=Min('pub_date'))['value']
+        if first is None:
+            return []
+        last = queryset.aggregate(value=Max('pub_date'))['value']
+        first = timezone.localtime(first).year
+        last = timezone.localtime(last).year
+        return [(str(year), str(year)) for year in range(last, first - 1, -1)]
+
+    def queryset(self, request, queryset):
+        # Годы вне диапазона datetime (0, 9999 и т. п.) фильтр пропускает,
+        # как и нечисловые значения.
+        try:
+            year = int(self.value())
+            start = timezone.make_aware(dt.datetime(year, 1, 1))
+            end = timezone.make_aware(dt.datetime(year + 1, 1, 1))
+        except (TypeError, ValueError, OverflowError):
+            return queryset
+        return queryset.filter(pub_date__gte=start, pub_date__lt=end)
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -12,13 +82,32 @@ class PostAdmin(admin.ModelAdmin):
         'group'
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
-    list_filter = ('pub_date',)
+    # Оба фильтра сравнивают pub_date с границами диапазона и читают
+    # строки по индексу.
+    list_filter = ('pub_date', PubDateYearFilter)
+    autocomplete_fields = ('group',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = '-пусто-'
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'group':
+            kwargs['widget'] = LoadedGroupSelect(
+                db_field.remote_field, self.admin_site,
+                using=kwargs.get('using'),
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_changelist_formset(self, request, **kwargs):
+        kwargs.setdefault('formset', PostChangeListFormSet)
+        return super().get_changelist_formset(request, **kwargs)
+
 
 class GroupAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('title',)}
+    search_fields = ('title', 'slug')
 
 
 admin.site.register(Post, PostAdmin)
@@ -0,0 +1,140 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Post
+
+# Порядок колонок архива: автор и группа хранятся по username и slug,
+# чтобы архив можно было загрузить в другую базу.
+FIELDS = ('text', 'pub_date', 'author', 'group')
+FORMATS = ('ndjson', 'csv')
+EXTENSIONS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+}
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+def detect_format(path):
+    for extension, archive_format in EXTENSIONS.items():
+        if path.lower().endswith(extension):
+            return archive_format
+    return None
+
+
+@contextmanager
+def open_archive(path, mode, standard_stream):
+    """Открывает файл архива; путь '-' означает stdin или stdout."""
+    if path == '-':
+        yield standard_stream
+        return
+    with open(path, mode, encoding='utf-8', newline='') as stream:
+        yield stream
+
+
+def read_rows(stream, archive_format):
+    """Построчно читает архив, выдавая пары (номер строки, словарь)."""
+    if archive_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            raise ArchiveError(f'строка {number}: {error}')
+        if not isinstance(row, dict):
+            raise ArchiveError(f'строка {number}: ожидался объект JSON')
+        yield number, row
+
+
+def write_rows(stream, archive_format, rows):
+    """Пишет кортежи в порядке FIELDS, не собирая их в памяти."""
+    if archive_format == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(FIELDS)
+        for row in rows:
+            writer.writerow(row)
+            yield
+        return
+
+    for row in rows:
+        data = json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False)
+        stream.write(data + '\n')
+        yield
+
+
+def parse_pub_date(value):
+    if not value:
+        return timezone.now()
+    try:
+        pub_date = parse_datetime(value)
+    except ValueError:
+        pub_date = None
+    if pub_date is None:
+        raise ArchiveError(f'некорректная дата {value!r}')
+    if timezone.is_naive(pub_date):
+        pub_date = timezone.make_aware(pub_date)
+    return pub_date
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextmanager
+def explicit_pub_date():
+    """Отключает auto_now_add у Post.pub_date, чтобы сохранить даты архива.
+
+    Меняет поле модели для всего процесса, поэтому годится только для
+    management-команд.
+    """
+    field = Post._meta.get_field('pub_date')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+class Progress:
+    """Печатает число обработанных строк и скорость в строках в секунду."""
+
+    def __init__(self, stream, every):
+        self.stream = stream
+        self.every = every
+        self.count = 0
+        self.reported = 0
+        self.started = time.monotonic()
+
+    @property
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return self.count / elapsed if elapsed else 0.0
+
+    def add(self, count=1):
+        self.count += count
+        if self.count - self.reported >= self.every:
+            self.report()
+
+    def report(self):
+        self.reported = self.count
+        self.stream.write(f'{self.count} строк, {self.rate:.0f} строк/с')
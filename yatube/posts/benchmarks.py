@@ -0,0 +1,145 @@
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.paginator import Paginator
+from django.template import engines
+from django.template.utils import InvalidTemplateEngineError
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+from core.benchmark import measure_memory, suite
+from core.routes import fast_reverse
+
+from .caching import feed_namespaces
+from .models import Post
+
+PAGE_SIZES = (10, 100)
+
+FEED_TEMPLATES = (
+    'posts/index.html',
+    'posts/group_list.html',
+    'posts/profile.html',
+)
+
+# Без кеша фрагментов шаблон ленты рендерится при каждом вызове.
+NO_CACHE = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+def get_request():
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    return request
+
+
+def render_feed(template, request, posts, **context):
+    page_obj = Paginator(posts, len(posts)).page(1)
+    return template.render({
+        'page_obj': page_obj,
+        'cache_namespaces': feed_namespaces('index'),
+        **context,
+    }, request)
+
+
+def get_jinja2_engine():
+    """Движок Jinja2 из настроек, даже если он не включён; None без пакета."""
+    try:
+        return engines['jinja2']
+    except InvalidTemplateEngineError:
+        pass
+    params = settings.JINJA2_TEMPLATES.copy()
+    try:
+        backend = import_string(params.pop('BACKEND'))
+    except ImportError:
+        return None
+    return backend({'APP_DIRS': False, **params})
+
+
+@suite('feed_rows')
+def feed_row_suite(benchmark):
+    """Экземпляры моделей против FeedRow: выборка страницы и её рендеринг.
+
+    Кроме задержки записывается пик памяти за один вызов, peak_kb.
+    """
+    request = get_request()
+    template = engines['django'].get_template('posts/index.html')
+    querysets = {
+        'models': Post.objects.for_list(),
+        'rows': Post.objects.feed_rows(),
+    }
+    for size in PAGE_SIZES:
+        for kind, queryset in querysets.items():
+            posts = list(queryset[:size])
+            cases = {
+                f'fetch {size} ({kind})': (
+                    lambda queryset=queryset, size=size: list(queryset[:size])
+                ),
+                f'render {size} ({kind})': (
+                    lambda posts=posts: render_feed(template, request, posts)
+                ),
+            }
+            with override_settings(CACHES=NO_CACHE):
+                for case, func in cases.items():
+                    result = benchmark.measure('feed_rows', case, func)
+                    result['peak_kb'] = measure_memory(func)
+
+
+@suite('templates')
+def template_suite(benchmark):
+    """Шаблоны лент на Django и Jinja2 для страниц из 10 и 100 постов."""
+    request = get_request()
+    dataset = benchmark.dataset
+    context = {
+        'group': dataset.group,
+        'author': dataset.author,
+        'posts_count': 0,
+    }
+    template_engines = {'django': engines['django']}
+    jinja2 = get_jinja2_engine()
+    if jinja2 is not None:
+        template_engines['jinja2'] = jinja2
+
+    with override_settings(CACHES=NO_CACHE):
+        for size in PAGE_SIZES:
+            posts = list(Post.objects.feed_rows()[:size])
+            for name in FEED_TEMPLATES:
+                for engine_name, engine in template_engines.items():
+                    template = engine.get_template(name)
+                    benchmark.measure(
+                        'templates',
+                        f'{name} {size} ({engine_name})',
+                        lambda template=template, posts=posts: render_feed(
+                            template, request, posts, **context
+                        ),
+                    )
+
+
+@suite('urls')
+def url_suite(benchmark):
+    """reverse() против fast_reverse() на ссылках из ленты."""
+    dataset = benchmark.dataset
+    routes = {
+        'posts:index': {},
+        'posts:post_detail': {'post_id': dataset.post.pk},
+        'posts:group_posts': {'slug': dataset.group.slug},
+        'posts:profile': {'username': dataset.author.username},
+    }
+    for viewname, kwargs in routes.items():
+        cases = {
+            f'{viewname} (reverse)': (
+                lambda viewname=viewname, kwargs=kwargs: reverse(
+                    viewname, kwargs=kwargs
+                )
+            ),
+            f'{viewname} (fast_reverse)': (
+                lambda viewname=viewname, kwargs=kwargs: fast_reverse(
+                    viewname, **kwargs
+                )
+            ),
+        }
+        for case, func in cases.items():
+            # Один вызов слишком короток для таймера, поэтому по 1000.
+            benchmark.measure(
+                'urls', case, lambda func=func: [func() for _ in range(1000)]
+            )
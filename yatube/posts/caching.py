@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag as etag_condition
+
+from core import fragment_cache
+from core.db import count_rows
+
+from .models import Group, Post
+
+COUNT_TIMEOUT = 10 * 60
+GROUP_CHOICES_KEY = 'posts:group_choices'
+GROUP_CHOICES_TIMEOUT = 60 * 60
+
+
+# Все ленты показывают названия и адреса групп и имена авторов.
+GROUPS_NAMESPACE = 'groups'
+AUTHORS_NAMESPACE = 'authors'
+
+
+def feed_scopes(author_id, group_id):
+    scopes = [f'author:{author_id}']
+    if group_id is not None:
+        scopes.append(f'group:{group_id}')
+    return scopes
+
+
+def count_key(scope):
+    return f'posts:count:{scope}'
+
+
+def count_posts():
+    return count_rows(
+        Post.objects.all(), settings.POSTS_COUNT_ESTIMATE_THRESHOLD
+    )
+
+
+def get_feed_count(scope, count_func):
+    count = cache.get(count_key(scope))
+    if count is None:
+        count = refresh_feed_count(scope, count_func)
+    return count
+
+
+def refresh_feed_count(scope, count_func):
+    count = count_func()
+    cache.set(count_key(scope), count, COUNT_TIMEOUT)
+    return count
+
+
+def invalidate_feed_counts(scopes):
+    cache.delete_many([count_key(scope) for scope in scopes])
+
+
+def feed_namespaces(scope):
+    return [scope, GROUPS_NAMESPACE, AUTHORS_NAMESPACE]
+
+
+def invalidate_feed_pages(scopes):
+    fragment_cache.bump(*scopes)
+
+
+def invalidate_now_and_on_commit(invalidate, using=None):
+    """
+    Вызывает invalidate() сразу и ещё раз после фиксации транзакции.
+
+    Между ними читатель ещё видит старые данные и может снова положить
+    их в кеш; повторный сброс после фиксации их убирает.
+    """
+    invalidate()
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(invalidate, using)
+
+
+def invalidate_feeds(page_scopes, count_scopes=(), using=None):
+    def invalidate():
+        if count_scopes:
+            invalidate_feed_counts(count_scopes)
+        invalidate_feed_pages(page_scopes)
+
+    invalidate_now_and_on_commit(invalidate, using)
+
+
+def get_group_choices():
+    """Пары (pk, название) всех групп для выбора группы в форме поста."""
+    choices = cache.get(GROUP_CHOICES_KEY)
+    if choices is None:
+        choices = list(Group.objects.order_by('pk').values_list('pk', 'title'))
+        cache.set(GROUP_CHOICES_KEY, choices, GROUP_CHOICES_TIMEOUT)
+    return choices
+
+
+def invalidate_groups():
+    fragment_cache.bump(GROUPS_NAMESPACE)
+    cache.delete(GROUP_CHOICES_KEY)
+
+
+def invalidate_authors():
+    fragment_cache.bump(AUTHORS_NAMESPACE)
+
+
+def conditional_page(get_namespaces):
+    """
+    Отвечает 304 Not Modified, если данные страницы не менялись.
+
+    get_namespaces(request, *args, **kwargs) возвращает пространства имён,
+    от которых зависит страница, или None, если её нет.
+    """
+    def etag(request, *args, **kwargs):
+        namespaces = get_namespaces(request, *args, **kwargs)
+        if namespaces is None:
+            return None
+        return fragment_cache.get_etag(
+            namespaces,
+            [
+                fragment_cache.auth_state(request.user),
+                request.GET.get('page'),
+                request.GET.get('after'),
+            ],
+        )
+
+    def decorator(view):
+        return cache_control(no_cache=True)(etag_condition(etag)(view))
+    return decorator
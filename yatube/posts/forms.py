@@ -1,6 +1,41 @@
 from django import forms
+from django.conf import settings
+from django.forms.models import ModelChoiceIterator
+from django.urls import reverse_lazy
 
-from .models import Post
+from .caching import get_group_choices
+from .models import Group, Post
+
+
+class CachedGroupChoiceIterator(ModelChoiceIterator):
+    """Варианты групп из кеша вместо запроса при каждом показе формы."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from get_group_choices()
+
+    def __len__(self):
+        return (
+            len(get_group_choices())
+            + (self.field.empty_label is not None)
+        )
+
+
+class GroupAutocompleteSelect(forms.Select):
+    """Список, в котором есть только выбранная группа.
+
+    Остальные группы подгружаются скриптом по мере ввода названия из
+    posts:group_lookup.
+    """
+
+    class Media:
+        js = ('js/group_autocomplete.js',)
+
+    def __init__(self, attrs=None, choices=()):
+        attrs = {'data-lookup-url': reverse_lazy('posts:group_lookup'),
+                 **(attrs or {})}
+        super().__init__(attrs, choices)
 
 
 class PostForm(forms.ModelForm):
@@ -16,6 +51,29 @@ class PostForm(forms.ModelForm):
             'group': 'Группа, к которой будет относиться пост',
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        field = self.fields['group']
+        if settings.POSTS_GROUP_AUTOCOMPLETE:
+            field.widget = GroupAutocompleteSelect()
+            field.widget.is_required = field.required
+            field.widget.choices = self.get_selected_group_choices()
+        else:
+            field.iterator = CachedGroupChoiceIterator
+            field.widget.choices = field.choices
+
+    def get_selected_group_choices(self):
+        choices = [('', self.fields['group'].empty_label)]
+        value = self['group'].value()
+        if value:
+            try:
+                choices += Group.objects.filter(pk=value).values_list(
+                    'pk', 'title'
+                )
+            except (TypeError, ValueError):
+                pass
+        return choices
+
     def clean_text(self):
         data = self.cleaned_data['text']
 
@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router
+from django.http import Http404
+
+from core import fragment_cache
+from core.lru import LRUCache
+
+from .caching import AUTHORS_NAMESPACE, GROUPS_NAMESPACE
+from .models import Group
+
+User = get_user_model()
+
+
+class ModelLookup:
+    """
+    Поиск объекта по уникальному полю через LRUCache процесса.
+
+    В кеше лежат значения полей, а не экземпляры: каждый вызов get()
+    возвращает новый объект, и закешированные связи одного запроса не
+    попадают в другой. Отсутствующие значения тоже кешируются, на
+    negative_timeout секунд, — ботам, перебирающим адреса, база не
+    отвечает на каждый запрос.
+
+    Сигналы сбрасывают записи только в своём процессе, поэтому вместе со
+    строкой запоминается поколение namespace из общего кеша фрагментов.
+    Строка прошлого поколения читается заново: иначе другой воркер
+    отрисовал бы с ней фрагмент уже нового поколения.
+    """
+
+    def __init__(self, model, field, cache, negative_timeout, namespace):
+        self.model = model
+        self.field = field
+        self.cache = cache
+        self.negative_timeout = negative_timeout
+        self.namespace = namespace
+        self.attnames = [
+            field.attname for field in model._meta.concrete_fields
+        ]
+        self.pk_index = self.attnames.index(model._meta.pk.attname)
+
+    def get(self, value):
+        generation, = fragment_cache.get_generations([self.namespace])
+        entry = self.cache.get(value)
+        if entry is not None and entry[0] == generation:
+            row = entry[1]
+        else:
+            row = (
+                self.model._default_manager
+                .filter(**{self.field: value})
+                .values_list(*self.attnames)
+                .first()
+            )
+            self.cache.set(
+                value,
+                (generation, row),
+                None if row is not None else self.negative_timeout,
+            )
+        if row is None:
+            return None
+        return self.model.from_db(
+            router.db_for_read(self.model), self.attnames, row
+        )
+
+    def get_or_404(self, value):
+        instance = self.get(value)
+        if instance is None:
+            raise Http404(
+                f'{self.model._meta.object_name} {value!r} не найден.'
+            )
+        return instance
+
+    def invalidate(self, instance):
+        # Запись ищется и по pk: значение поля могло измениться.
+        value = getattr(instance, self.field)
+        self.cache.delete_matching(
+            lambda key, entry: key == value or (
+                entry[1] is not None and entry[1][self.pk_index] == instance.pk
+            )
+        )
+
+
+groups = ModelLookup(
+    Group,
+    'slug',
+    LRUCache(
+        'posts:groups',
+        settings.POSTS_LOOKUP_CACHE_SIZE,
+        settings.POSTS_LOOKUP_CACHE_TIMEOUT,
+    ),
+    settings.POSTS_LOOKUP_CACHE_NEGATIVE_TIMEOUT,
+    GROUPS_NAMESPACE,
+)
+
+authors = ModelLookup(
+    User,
+    User.USERNAME_FIELD,
+    LRUCache(
+        'posts:authors',
+        settings.POSTS_LOOKUP_CACHE_SIZE,
+        settings.POSTS_LOOKUP_CACHE_TIMEOUT,
+    ),
+    settings.POSTS_LOOKUP_CACHE_NEGATIVE_TIMEOUT,
+    AUTHORS_NAMESPACE,
+)
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.archive import (FORMATS, Progress, detect_format, open_archive,
+                           write_rows)
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает посты в архив NDJSON или CSV, который понимает '
+        'команда import_posts.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help="Файл архива или '-' для вывода в stdout.",
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='Формат архива; по умолчанию определяется по расширению.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество постов, читаемых из базы за один раз.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        archive_format = options['format'] or detect_format(path)
+        if archive_format is None:
+            raise CommandError(
+                'Не удалось определить формат архива, укажите --format.'
+            )
+
+        posts = (
+            Post.objects.order_by('pk')
+            .values_list('text', 'pub_date', 'author__username', 'group__slug')
+            .iterator(chunk_size=options['batch_size'])
+        )
+        rows = (
+            (text, pub_date.isoformat(), username, slug or '')
+            for text, pub_date, username, slug in posts
+        )
+
+        # При выводе в stdout прогресс уходит в stderr, чтобы не
+        # смешиваться с архивом.
+        log = self.stderr if path == '-' else self.stdout
+        progress = Progress(log, options['batch_size'])
+        try:
+            with open_archive(path, 'w', self.stdout) as stream:
+                for _ in write_rows(stream, archive_format, rows):
+                    progress.add()
+        except OSError as error:
+            raise CommandError(f'Не удалось записать архив: {error}')
+
+        progress.report()
+        if path != '-':
+            self.stdout.write(self.style.SUCCESS(
+                f'Выгружено постов: {progress.count}.'
+            ))
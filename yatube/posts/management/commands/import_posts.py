@@ -0,0 +1,148 @@
+import sys
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from posts.archive import (FORMATS, ArchiveError, Progress, chunked,
+                           detect_format, explicit_pub_date, open_archive,
+                           parse_pub_date, read_rows)
+from posts.caching import (feed_scopes, invalidate_feed_counts,
+                           invalidate_feed_pages)
+from posts.models import AuthorStats, Group, Post
+
+User = get_user_model()
+
+# Ограничение на число параметров в одном запросе IN (...).
+LOOKUP_CHUNK_SIZE = 500
+
+
+def get_value(row, name):
+    value = row.get(name)
+    return '' if value is None else str(value).strip()
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает посты из архива NDJSON или CSV с колонками '
+        'text, pub_date, author (username) и group (slug).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help="Файл архива или '-' для чтения из stdin.",
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='Формат архива; по умолчанию определяется по расширению.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество постов в одной транзакции.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        archive_format = options['format'] or detect_format(path)
+        if archive_format is None:
+            raise CommandError(
+                'Не удалось определить формат архива, укажите --format.'
+            )
+
+        self.authors = {}
+        self.groups = {}
+        self.skipped = 0
+        progress = Progress(self.stdout, options['batch_size'])
+        try:
+            with open_archive(path, 'r', sys.stdin) as stream, \
+                    explicit_pub_date():
+                rows = read_rows(stream, archive_format)
+                for batch in chunked(rows, options['batch_size']):
+                    progress.add(self.import_batch(batch))
+        except (ArchiveError, OSError) as error:
+            raise CommandError(
+                f'Импорт остановлен после {progress.count} постов: {error}'
+            )
+
+        progress.report()
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено постов: {progress.count}, '
+            f'пропущено строк: {self.skipped}.'
+        ))
+
+    def resolve(self, cache, queryset, field, values):
+        """Дополняет кеш pk по username или slug одним запросом на пачку."""
+        missing = {value for value in values if value and value not in cache}
+        for chunk in chunked(missing, LOOKUP_CHUNK_SIZE):
+            found = dict(
+                queryset.filter(**{f'{field}__in': chunk}).values_list(
+                    field, 'pk'
+                )
+            )
+            for value in chunk:
+                cache[value] = found.get(value)
+
+    def build_post(self, row):
+        text = row.get('text')
+        if not text or not isinstance(text, str):
+            raise ArchiveError('пустой текст поста')
+
+        username = get_value(row, 'author')
+        author_id = self.authors.get(username)
+        if author_id is None:
+            raise ArchiveError(f'неизвестный автор {username!r}')
+
+        slug = get_value(row, 'group')
+        group_id = None
+        if slug:
+            group_id = self.groups.get(slug)
+            if group_id is None:
+                raise ArchiveError(f'неизвестная группа {slug!r}')
+
+        post = Post(
+            text=text,
+            author_id=author_id,
+            group_id=group_id,
+            pub_date=parse_pub_date(get_value(row, 'pub_date')),
+        )
+        post.render()
+        return post
+
+    def import_batch(self, batch):
+        self.resolve(
+            self.authors, User.objects, 'username',
+            [get_value(row, 'author') for _, row in batch],
+        )
+        self.resolve(
+            self.groups, Group.objects, 'slug',
+            [get_value(row, 'group') for _, row in batch],
+        )
+
+        posts = []
+        for number, row in batch:
+            try:
+                posts.append(self.build_post(row))
+            except ArchiveError as error:
+                self.skipped += 1
+                self.stderr.write(f'Строка {number} пропущена: {error}')
+
+        # bulk_create не вызывает save() и не отправляет сигналы: анонс и
+        # HTML заполняются в build_post, счётчики авторов и кеш лент —
+        # здесь, поисковый индекс — триггерами базы.
+        with transaction.atomic():
+            Post.objects.bulk_create(posts)
+            authors = Counter(post.author_id for post in posts)
+            for author_id, posts_count in authors.items():
+                AuthorStats.add_posts(author_id, posts_count)
+
+        scopes = {'index'}
+        for post in posts:
+            scopes.update(feed_scopes(post.author_id, post.group_id))
+        invalidate_feed_counts(scopes)
+        invalidate_feed_pages(scopes)
+        return len(posts)
@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+
+from posts.models import AuthorStats, Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов авторов по таблице постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только сверить счётчики, ничего не меняя.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк в одном запросе на запись.',
+        )
+
+    def handle(self, *args, **options):
+        actual = dict(
+            Post.objects.order_by()
+            .values('author_id')
+            .annotate(posts_count=Count('pk'))
+            .values_list('author_id', 'posts_count')
+            .iterator()
+        )
+        stored = dict(
+            AuthorStats.objects.values_list('author_id', 'posts_count')
+            .iterator()
+        )
+        mismatched = {
+            author_id: actual.get(author_id, 0)
+            for author_id in actual.keys() | stored.keys()
+            if actual.get(author_id, 0) != stored.get(author_id)
+        }
+
+        if options['check']:
+            for author_id, posts_count in sorted(mismatched.items()):
+                self.stdout.write(
+                    f'Автор {author_id}: сохранено '
+                    f'{stored.get(author_id)}, на самом деле {posts_count}'
+                )
+            if mismatched:
+                raise CommandError(
+                    f'Расходятся счётчики у {len(mismatched)} авторов.'
+                )
+            self.stdout.write(self.style.SUCCESS('Счётчики в порядке.'))
+            return
+
+        author_ids = sorted(mismatched)
+        batch_size = options['batch_size']
+        for start in range(0, len(author_ids), batch_size):
+            batch = author_ids[start:start + batch_size]
+            with transaction.atomic():
+                existing = set(
+                    User.objects.filter(pk__in=batch).values_list(
+                        'pk', flat=True
+                    )
+                )
+                AuthorStats.objects.filter(pk__in=batch).delete()
+                AuthorStats.objects.bulk_create(
+                    AuthorStats(
+                        author_id=author_id,
+                        posts_count=mismatched[author_id],
+                    )
+                    for author_id in batch
+                    if author_id in existing
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлены счётчики у {len(mismatched)} авторов.'
+        ))
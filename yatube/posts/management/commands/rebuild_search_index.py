@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from posts.search import rebuild_search_index, uses_fts
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс постов (SQLite FTS5).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='База данных, в которой перестраивается индекс.',
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if not uses_fts(using):
+            self.stdout.write(
+                'Полнотекстовый индекс ведётся только для SQLite, '
+                'поиск использует обычные запросы.'
+            )
+            return
+        rebuild_search_index(using)
+        self.stdout.write(self.style.SUCCESS('Индекс перестроен.'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.rendering import RENDERER_VERSION, rerender_posts
+
+
+class Command(BaseCommand):
+    help = 'Перерисовывает сохранённый HTML постов по текущим правилам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Перерисовать все посты, а не только устаревшие.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Количество постов в одном запросе на запись.',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.all()
+        if not options['all']:
+            posts = posts.exclude(render_version=RENDERER_VERSION)
+        rendered = rerender_posts(posts, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Перерисовано постов: {rendered}.'
+        ))
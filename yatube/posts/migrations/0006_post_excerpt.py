@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_search_index'),
+    ]
+
+    # Анонсы существующих постов заполняет 0011_fill_post_excerpts, по
+    # транзакции на пачку.
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=301, verbose_name='Анонс'),
+        ),
+    ]
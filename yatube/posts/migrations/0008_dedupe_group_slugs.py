@@ -0,0 +1,60 @@
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+SLUG_LENGTH = 50
+
+
+def make_unique_slug(slug, taken):
+    number = 2
+    while True:
+        suffix = f'-{number}'
+        candidate = slug[:SLUG_LENGTH - len(suffix)] + suffix
+        if candidate not in taken:
+            taken.add(candidate)
+            return candidate
+        number += 1
+
+
+def dedupe_group_slugs(apps, schema_editor):
+    # Уникальный индекс в 0009 не создастся, пока в таблице есть
+    # одинаковые slug. Адрес остаётся у самой старой группы, остальные
+    # получают суффикс -2, -3 и т. д.
+    Group = apps.get_model('posts', 'Group')
+    using = schema_editor.connection.alias
+    groups = Group.objects.using(using)
+    taken = set(groups.values_list('slug', flat=True).iterator())
+    seen = set()
+    last_pk = 0
+    while True:
+        with transaction.atomic(using=using):
+            batch = list(
+                groups.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .only('pk', 'slug')[:BATCH_SIZE]
+            )
+            renamed = []
+            for group in batch:
+                if group.slug not in seen:
+                    seen.add(group.slug)
+                    continue
+                group.slug = make_unique_slug(group.slug, taken)
+                renamed.append(group)
+            groups.bulk_update(renamed, ['slug'])
+        if len(batch) < BATCH_SIZE:
+            break
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    # Каждая пачка фиксируется отдельно: SQLite не держит блокировку на
+    # запись всё время обработки.
+    atomic = False
+
+    dependencies = [
+        ('posts', '0007_post_rendered_html'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_group_slugs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0008_dedupe_group_slugs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='group',
+            name='slug',
+            field=models.SlugField(unique=True),
+        ),
+        migrations.AlterField(
+            model_name='group',
+            name='title',
+            field=models.CharField(max_length=200),
+        ),
+        migrations.AlterModelOptions(
+            name='post',
+            options={'ordering': ['-pub_date']},
+        ),
+        # Поля постов расходились с моделью только в том, что в базе не
+        # хранится: подписях, related_name и on_delete. AlterField
+        # пересоздал бы таблицу постов в SQLite и внешние ключи в
+        # PostgreSQL, поэтому меняется только состояние миграций.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='post',
+                    name='author',
+                    field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='posts', to=settings.AUTH_USER_MODEL, verbose_name='Автор'),
+                ),
+                migrations.AlterField(
+                    model_name='post',
+                    name='group',
+                    field=models.ForeignKey(blank=True, help_text='Выберите группу', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='posts', to='posts.Group', verbose_name='Группа'),
+                ),
+                migrations.AlterField(
+                    model_name='post',
+                    name='pub_date',
+                    field=models.DateTimeField(auto_now_add=True, verbose_name='Дата публикации'),
+                ),
+                migrations.AlterField(
+                    model_name='post',
+                    name='text',
+                    field=models.TextField(help_text='Введите текст поста', verbose_name='Текст поста'),
+                ),
+            ],
+        ),
+    ]
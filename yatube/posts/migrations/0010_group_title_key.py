@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+def fill_title_keys(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+
+    groups = list(Group.objects.only('pk', 'title').order_by('pk'))
+    for group in groups:
+        group.title_key = group.title.casefold()[:200]
+    Group.objects.bulk_update(groups, ['title_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_group_slug_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='title_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=200),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_title_keys, migrations.RunPython.noop),
+    ]
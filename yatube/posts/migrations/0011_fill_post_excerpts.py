@@ -0,0 +1,54 @@
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+EXCERPT_LENGTH = 300
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    # Копия posts.models.make_excerpt на момент миграции.
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    boundary = max(cut.rfind(' '), cut.rfind('\n'))
+    if boundary > length // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + '…'
+
+
+def fill_excerpts(apps, schema_editor):
+    # Анонсы заполнялись здесь же в 0006, одной транзакцией на всю
+    # таблицу; там, где 0006 уже применена, пустых анонсов нет.
+    Post = apps.get_model('posts', 'Post')
+    using = schema_editor.connection.alias
+    posts = (
+        Post.objects.using(using)
+        .filter(excerpt='')
+        .exclude(text='')
+        .order_by('pk')
+        .only('pk', 'text')
+    )
+    last_pk = 0
+    while True:
+        with transaction.atomic(using=using):
+            batch = list(posts.filter(pk__gt=last_pk)[:BATCH_SIZE])
+            for post in batch:
+                post.excerpt = make_excerpt(post.text)
+            Post.objects.using(using).bulk_update(batch, ['excerpt'])
+        if len(batch) < BATCH_SIZE:
+            break
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    # Каждая пачка фиксируется отдельно: SQLite не держит блокировку на
+    # запись всё время заполнения.
+    atomic = False
+
+    dependencies = [
+        ('posts', '0010_group_title_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
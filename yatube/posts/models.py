@@ -1,17 +1,73 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils.safestring import mark_safe
+
+from core.routes import fast_reverse
+
+from .rendering import RENDERED_FIELDS, RENDERER_VERSION, render_text
+from .rows import FEED_FIELDS, FeedRowIterable
 
 User = get_user_model()
 
+EXCERPT_LENGTH = 300
+TITLE_KEY_LENGTH = 200
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """Начало текста для лент, обрезанное по границе слова."""
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    boundary = max(cut.rfind(' '), cut.rfind('\n'))
+    if boundary > length // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + '…'
+
+
+def make_title_key(title):
+    """Название без учёта регистра для поиска групп по началу названия."""
+    return title.casefold()[:TITLE_KEY_LENGTH]
+
 
 class Group(models.Model):
     title = models.CharField(max_length=200)
+    # LIKE в SQLite не различает регистр только для латиницы и не
+    # использует индекс, поэтому поиск идёт по диапазону этого поля.
+    title_key = models.CharField(
+        max_length=TITLE_KEY_LENGTH, db_index=True, editable=False
+    )
     slug = models.SlugField(unique=True)
     description = models.TextField()
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'title' in update_fields:
+            self.title_key = make_title_key(self.title)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'title_key'}
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        return fast_reverse('posts:group_posts', slug=self.slug)
+
+
+class PostQuerySet(models.QuerySet):
+    def for_feed(self):
+        return self.select_related('author', 'group')
+
+    def for_list(self):
+        # Полный текст нужен только странице поста, ленты выводят анонс.
+        return self.for_feed().defer('text', 'text_html')
+
+    def feed_rows(self):
+        """Посты лент в виде FeedRow, см. posts.rows."""
+        clone = self.values_list(*FEED_FIELDS)
+        clone._iterable_class = FeedRowIterable
+        return clone
+
 
 class Post(models.Model):
     text = models.TextField(
@@ -38,8 +94,123 @@ class Post(models.Model):
         help_text='Выберите группу',
     )
 
+    excerpt = models.CharField(
+        verbose_name='Анонс',
+        max_length=EXCERPT_LENGTH + 1,
+        blank=True,
+        editable=False,
+    )
+    text_html = models.TextField(blank=True, editable=False)
+    excerpt_html = models.TextField(blank=True, editable=False)
+    render_version = models.PositiveSmallIntegerField(
+        default=0, editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(fields=['pub_date'], name='post_pub_date_idx'),
+            models.Index(
+                fields=['author', 'pub_date'],
+                name='post_author_pub_date_idx',
+            ),
+            models.Index(
+                fields=['group', 'pub_date'],
+                name='post_group_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text[:15]
+
+    def get_absolute_url(self):
+        return fast_reverse('posts:post_detail', post_id=self.pk)
+
+    def get_edit_url(self):
+        return fast_reverse('posts:post_edit', post_id=self.pk)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.render()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *RENDERED_FIELDS}
+        super().save(*args, **kwargs)
+
+    def render(self):
+        """Заполняет анонс и HTML текста по текущим правилам."""
+        self.excerpt = make_excerpt(self.text)
+        self.text_html = render_text(self.text)
+        self.excerpt_html = render_text(self.excerpt)
+        self.render_version = RENDERER_VERSION
+
+    @property
+    def is_rendered(self):
+        return self.render_version == RENDERER_VERSION
+
+    @property
+    def rendered_text(self):
+        if self.is_rendered:
+            return mark_safe(self.text_html)
+        self.schedule_rerender()
+        return render_text(self.text)
+
+    @property
+    def rendered_excerpt(self):
+        if self.is_rendered:
+            return mark_safe(self.excerpt_html)
+        self.schedule_rerender()
+        return render_text(self.excerpt)
+
+    @staticmethod
+    def schedule_rerender():
+        from .tasks import schedule_rerender
+
+        schedule_rerender()
+
+
+class AuthorStats(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_stats',
+        verbose_name='Автор',
+    )
+    posts_count = models.PositiveIntegerField(
+        verbose_name='Количество постов',
+        default=0,
+    )
+
+    class Meta:
+        verbose_name = 'Статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return f'{self.author_id}: {self.posts_count}'
+
+    @classmethod
+    def get_posts_count(cls, author):
+        try:
+            return author.post_stats.posts_count
+        except cls.DoesNotExist:
+            return author.posts.count()
+
+    @classmethod
+    def add_posts(cls, author_id, delta):
+        updated = cls.objects.filter(author_id=author_id).update(
+            posts_count=models.F('posts_count') + delta
+        )
+        # Строки ещё нет: при добавлении поста считаем её с нуля, при
+        # удалении ничего не создаём — автор может удаляться вместе с ней.
+        if not updated and delta > 0:
+            cls.objects.get_or_create(
+                author_id=author_id,
+                defaults={
+                    'posts_count': Post.objects.filter(
+                        author_id=author_id
+                    ).count()
+                },
+            )
@@ -0,0 +1,122 @@
+import datetime as dt
+
+from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from core.db import count_rows
+
+from .caching import get_feed_count
+
+EPOCH = dt.datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+# Отрицательные микросекунды у дат до 1970 года содержат '-', поэтому
+# части курсора разделяются '_'.
+CURSOR_SEPARATOR = '_'
+
+
+def encode_cursor(post):
+    delta = post.pub_date - EPOCH
+    microseconds = (
+        (delta.days * 86400 + delta.seconds) * 10 ** 6 + delta.microseconds
+    )
+    return f'{microseconds}{CURSOR_SEPARATOR}{post.pk}'
+
+
+def decode_cursor(cursor):
+    try:
+        microseconds, pk = (
+            int(part) for part in cursor.split(CURSOR_SEPARATOR)
+        )
+    except (AttributeError, ValueError):
+        return None
+    if pk < 1:
+        return None
+    try:
+        pub_date = EPOCH + dt.timedelta(microseconds=microseconds)
+    except OverflowError:
+        return None
+    return pub_date, pk
+
+
+class CursorPage(Page):
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, cursor, next_cursor):
+        super().__init__(object_list, None, paginator)
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+
+    def __repr__(self):
+        return f'<Page after {self.cursor or "start"}>'
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.cursor is not None
+
+    def next_page_number(self):
+        return None
+
+    def previous_page_number(self):
+        return None
+
+    def start_index(self):
+        return None
+
+    def end_index(self):
+        return None
+
+
+class CursorPaginator(Paginator):
+    """Постраничный вывод по ключу (pub_date, id) без COUNT и OFFSET."""
+
+    ordering = ('-pub_date', '-pk')
+
+    def get_page_after(self, cursor):
+        position = decode_cursor(cursor) if cursor else None
+        queryset = self.object_list.order_by(*self.ordering)
+
+        if position is None:
+            cursor = None
+        else:
+            pub_date, pk = position
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            )
+
+        posts = list(queryset[:self.per_page + 1])
+        next_cursor = None
+        if len(posts) > self.per_page:
+            posts = posts[:self.per_page]
+            next_cursor = encode_cursor(posts[-1])
+
+        return CursorPage(posts, self, cursor, next_cursor)
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который берёт общее число постов из кеша."""
+
+    def __init__(self, object_list, per_page, scope, count_func=None,
+                 **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.scope = scope
+        self.count_func = count_func or self.object_list.count
+
+    @cached_property
+    def count(self):
+        return get_feed_count(self.scope, self.count_func)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator, который для большой таблицы без фильтров не делает COUNT."""
+
+    @cached_property
+    def count(self):
+        return count_rows(
+            self.object_list, settings.POSTS_COUNT_ESTIMATE_THRESHOLD
+        )
@@ -0,0 +1,23 @@
+from django.template.defaultfilters import linebreaksbr
+
+from core.db import backfill
+
+# Увеличивается при любом изменении правил оформления текста: HTML,
+# сохранённый с меньшей версией, перерисовывается фоновой задачей.
+RENDERER_VERSION = 1
+
+RENDERED_FIELDS = ('excerpt', 'text_html', 'excerpt_html', 'render_version')
+
+
+def render_text(text):
+    return linebreaksbr(text, autoescape=True)
+
+
+def rerender_posts(queryset, batch_size=500):
+    """Перерисовывает HTML постов пачками по pk; возвращает их число."""
+    return backfill(
+        queryset.only('pk', 'text'),
+        queryset.model.render,
+        RENDERED_FIELDS,
+        batch_size,
+    )
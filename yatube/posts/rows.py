@@ -0,0 +1,127 @@
+"""
+Лёгкие строки лент вместо экземпляров моделей.
+
+Ленты выводят десяток полей поста, автора и группы; FeedRowIterable
+читает только их одним запросом и собирает объекты со __slots__ без
+состояния моделей, а автор и группа создаются один раз на страницу,
+сколько бы постов у них на ней ни было. Шаблоны обращаются к строкам
+так же, как к постам.
+"""
+from django.db.models.query import ValuesListIterable
+from django.utils.safestring import mark_safe
+
+from core.routes import fast_reverse
+
+from .rendering import RENDERER_VERSION, render_text
+
+FEED_FIELDS = (
+    'pk',
+    'pub_date',
+    'excerpt',
+    'excerpt_html',
+    'render_version',
+    'author_id',
+    'author__username',
+    'author__first_name',
+    'author__last_name',
+    'group_id',
+    'group__title',
+    'group__slug',
+)
+
+
+class AuthorRow:
+    __slots__ = ('pk', 'username', 'first_name', 'last_name')
+
+    def __init__(self, pk, username, first_name, last_name):
+        self.pk = pk
+        self.username = username
+        self.first_name = first_name
+        self.last_name = last_name
+
+    def __str__(self):
+        return self.username
+
+    def get_full_name(self):
+        # Как AbstractUser.get_full_name().
+        return f'{self.first_name} {self.last_name}'.strip()
+
+    def get_absolute_url(self):
+        return fast_reverse('posts:profile', username=self.username)
+
+
+class GroupRow:
+    __slots__ = ('pk', 'title', 'slug')
+
+    def __init__(self, pk, title, slug):
+        self.pk = pk
+        self.title = title
+        self.slug = slug
+
+    def __str__(self):
+        return self.title
+
+    def get_absolute_url(self):
+        return fast_reverse('posts:group_posts', slug=self.slug)
+
+
+class FeedRow:
+    __slots__ = (
+        'pk', 'pub_date', 'excerpt', 'excerpt_html', 'render_version',
+        'author', 'group',
+    )
+
+    def __init__(self, pk, pub_date, excerpt, excerpt_html, render_version,
+                 author, group):
+        self.pk = pk
+        self.pub_date = pub_date
+        self.excerpt = excerpt
+        self.excerpt_html = excerpt_html
+        self.render_version = render_version
+        self.author = author
+        self.group = group
+
+    def __repr__(self):
+        return f'<FeedRow: {self.pk}>'
+
+    def get_absolute_url(self):
+        return fast_reverse('posts:post_detail', post_id=self.pk)
+
+    def get_edit_url(self):
+        return fast_reverse('posts:post_edit', post_id=self.pk)
+
+    @property
+    def rendered_excerpt(self):
+        if self.render_version == RENDERER_VERSION:
+            return mark_safe(self.excerpt_html)
+        from .tasks import schedule_rerender
+
+        schedule_rerender()
+        return render_text(self.excerpt)
+
+
+class FeedRowIterable(ValuesListIterable):
+    """Выдаёт FeedRow по кортежам значений FEED_FIELDS."""
+
+    def __iter__(self):
+        authors = {}
+        groups = {}
+        for (pk, pub_date, excerpt, excerpt_html, render_version,
+             author_id, username, first_name, last_name,
+             group_id, group_title, group_slug) in super().__iter__():
+            author = authors.get(author_id)
+            if author is None:
+                author = authors[author_id] = AuthorRow(
+                    author_id, username, first_name, last_name
+                )
+            group = None
+            if group_id is not None:
+                group = groups.get(group_id)
+                if group is None:
+                    group = groups[group_id] = GroupRow(
+                        group_id, group_title, group_slug
+                    )
+            yield FeedRow(
+                pk, pub_date, excerpt, excerpt_html, render_version,
+                author, group,
+            )
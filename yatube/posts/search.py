@@ -0,0 +1,128 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .models import Post
+
+SEARCH_TABLE = 'posts_post_fts'
+
+# Внешний контент: FTS5 хранит только индекс, тексты берутся из
+# posts_post по rowid (он же id поста).
+CREATE_TABLE_SQL = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+    "text, content='posts_post', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+
+# Таблица posts_post пересоздаётся SQLite при части миграций, и триггеры
+# удаляются вместе с ней, поэтому они создаются идемпотентно.
+CREATE_TRIGGERS_SQL = [
+    f'CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai '
+    'AFTER INSERT ON posts_post BEGIN '
+    f'INSERT INTO {SEARCH_TABLE}(rowid, text) VALUES (new.id, new.text); '
+    'END',
+    f'CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad '
+    'AFTER DELETE ON posts_post BEGIN '
+    f'INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, text) '
+    "VALUES ('delete', old.id, old.text); "
+    'END',
+    f'CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au '
+    'AFTER UPDATE OF text ON posts_post BEGIN '
+    f'INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, text) '
+    "VALUES ('delete', old.id, old.text); "
+    f'INSERT INTO {SEARCH_TABLE}(rowid, text) VALUES (new.id, new.text); '
+    'END',
+]
+
+
+def uses_fts(using=DEFAULT_DB_ALIAS):
+    return connections[using].vendor == 'sqlite'
+
+
+def ensure_search_index(using=DEFAULT_DB_ALIAS, create_table=True):
+    if not uses_fts(using):
+        return
+    connection = connections[using]
+    tables = connection.introspection.table_names()
+    if 'posts_post' not in tables:
+        return
+    if SEARCH_TABLE not in tables and not create_table:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_TABLE_SQL)
+        for sql in CREATE_TRIGGERS_SQL:
+            cursor.execute(sql)
+
+
+def rebuild_search_index(using=DEFAULT_DB_ALIAS):
+    if not uses_fts(using):
+        return
+    ensure_search_index(using)
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+        )
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')"
+        )
+
+
+def build_match(words):
+    # Каждое слово ищется как префикс: «пост» находит «постов».
+    return ' '.join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+
+class SearchResults:
+    """Ленивый список найденных постов, отсортированных по релевантности."""
+
+    def __init__(self, query, using=DEFAULT_DB_ALIAS):
+        self.words = re.findall(r'\w+', query)
+        self.match = build_match(self.words)
+        self.using = using
+
+    def _execute(self, sql, params):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def count(self):
+        if not self.match:
+            return 0
+        if not uses_fts(self.using):
+            return self._fallback().count()
+        rows = self._execute(
+            f'SELECT COUNT(*) FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s',
+            [self.match],
+        )
+        return rows[0][0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        if not self.match:
+            return []
+        if not uses_fts(self.using):
+            return list(self._fallback()[index])
+
+        offset = index.start or 0
+        limit = -1 if index.stop is None else max(index.stop - offset, 0)
+        ids = [
+            row[0] for row in self._execute(
+                f'SELECT rowid FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s '
+                'ORDER BY rank LIMIT %s OFFSET %s',
+                [self.match, limit, offset],
+            )
+        ]
+        posts = Post.objects.using(self.using).for_list().in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+    def _fallback(self):
+        queryset = Post.objects.using(self.using).for_list()
+        for word in self.words:
+            queryset = queryset.filter(text__icontains=word)
+        return queryset
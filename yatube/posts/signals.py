@@ -0,0 +1,93 @@
+from django.db.models.signals import (post_delete, post_migrate, post_save,
+                                      pre_save)
+from django.contrib.auth import get_user_model
+from django.dispatch import receiver
+
+from .caching import (feed_scopes, invalidate_authors, invalidate_feeds,
+                      invalidate_groups, invalidate_now_and_on_commit)
+from .lookups import authors, groups
+from .models import AuthorStats, Group, Post
+from .search import ensure_search_index
+
+User = get_user_model()
+
+TRACKED_FIELDS = {'author', 'group'}
+# Поля пользователя, которые выводят страницы с постами.
+AUTHOR_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver(pre_save, sender=Post)
+def track_feed_change(sender, instance, raw, update_fields, **kwargs):
+    instance._previous_feeds = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not TRACKED_FIELDS & set(update_fields):
+        return
+
+    previous = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list('author_id', 'group_id')
+        .first()
+    )
+    if previous is not None and previous != (
+        instance.author_id, instance.group_id
+    ):
+        instance._previous_feeds = previous
+
+
+@receiver(post_save, sender=Post)
+def refresh_saved_post_feeds(sender, instance, created, raw, using,
+                             **kwargs):
+    if raw:
+        return
+    scopes = feed_scopes(instance.author_id, instance.group_id)
+    count_scopes = ()
+
+    if created:
+        AuthorStats.add_posts(instance.author_id, 1)
+        count_scopes = ['index', *scopes]
+    elif instance._previous_feeds is not None:
+        previous_author_id, previous_group_id = instance._previous_feeds
+        if previous_author_id != instance.author_id:
+            AuthorStats.add_posts(previous_author_id, -1)
+            AuthorStats.add_posts(instance.author_id, 1)
+        scopes += feed_scopes(previous_author_id, previous_group_id)
+        count_scopes = scopes
+
+    invalidate_feeds(['index', *scopes], count_scopes, using)
+
+
+@receiver(post_delete, sender=Post)
+def refresh_deleted_post_feeds(sender, instance, using, **kwargs):
+    scopes = ['index', *feed_scopes(instance.author_id, instance.group_id)]
+    AuthorStats.add_posts(instance.author_id, -1)
+    invalidate_feeds(scopes, scopes, using)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_pages(sender, instance, using, raw=False, **kwargs):
+    groups.invalidate(instance)
+    if not raw:
+        invalidate_now_and_on_commit(invalidate_groups, using)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author_pages(sender, instance, using, raw=False,
+                            update_fields=None, **kwargs):
+    authors.invalidate(instance)
+    # Вход в систему сохраняет только last_login, страницы от него
+    # не зависят.
+    if raw or update_fields is not None and not (
+        AUTHOR_FIELDS & set(update_fields)
+    ):
+        return
+    invalidate_now_and_on_commit(invalidate_authors, using)
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    # Пересоздание posts_post в миграциях SQLite удаляет её триггеры.
+    if sender.name == 'posts':
+        ensure_search_index(using, create_table=False)
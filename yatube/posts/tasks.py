@@ -0,0 +1,29 @@
+import time
+
+from core.tasks import enqueue_on_commit, task
+
+from .models import Post
+from .rendering import RENDERER_VERSION, rerender_posts
+
+# Не чаще одной постановки перерисовки в минуту на процесс.
+RERENDER_INTERVAL = 60
+
+_rerender_scheduled_at = None
+
+
+@task
+def rerender_stale_posts():
+    """Перерисовывает HTML постов, сохранённый старой версией правил."""
+    rerender_posts(Post.objects.exclude(render_version=RENDERER_VERSION))
+
+
+def schedule_rerender():
+    global _rerender_scheduled_at
+    now = time.monotonic()
+    if (
+        _rerender_scheduled_at is not None
+        and now - _rerender_scheduled_at < RERENDER_INTERVAL
+    ):
+        return
+    _rerender_scheduled_at = now
+    enqueue_on_commit(rerender_stale_posts)
@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class PostAdminChangeListTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        for i in range(12):
+            author = User.objects.create_user(username=f'author_{i}')
+            group = Group.objects.create(
+                title=f'Группа №{i}',
+                slug=f'group-{i}',
+                description='Тестовое описание',
+            )
+            Post.objects.create(author=author, group=group, text=f'Пост №{i}')
+        cls.url = reverse('admin:posts_post_changelist')
+
+    def setUp(self):
+        self.admin_client = Client()
+
+        self.admin_client.force_login(PostAdminChangeListTests.admin)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.admin_client.get(url)
+        return response, [query['sql'] for query in queries.captured_queries]
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Число запросов списка постов не зависит от числа строк."""
+        _, queries = self.get(self.url)
+
+        for i in range(12, 24):
+            author = User.objects.create_user(username=f'author_{i}')
+            group = Group.objects.create(
+                title=f'Группа №{i}', slug=f'group-{i}', description='-'
+            )
+            Post.objects.create(author=author, group=group, text=f'Пост №{i}')
+        response, more_queries = self.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(more_queries), len(queries))
+
+    def test_group_widget_does_not_list_all_groups(self):
+        """В строке списка выводится только текущая группа поста."""
+        response, queries = self.get(self.url)
+        post = Post.objects.select_related('group').first()
+
+        self.assertContains(response, 'admin-autocomplete')
+        self.assertContains(response, f'<option value="{post.group.pk}"')
+        self.assertContains(
+            response, f'>{post.group.title}</option>', count=1
+        )
+        self.assertFalse(any(
+            query.startswith('SELECT "posts_group"') for query in queries
+        ))
+
+    @override_settings(POSTS_COUNT_ESTIMATE_THRESHOLD=1)
+    def test_unfiltered_changelist_uses_estimated_count(self):
+        """Без фильтров число постов берётся из статистики СУБД."""
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        response, queries = self.get(self.url)
+
+        self.assertEqual(response.context['cl'].result_count, 12)
+        self.assertFalse(any('COUNT(' in query for query in queries))
+
+    def test_year_filter_does_not_scan_dates(self):
+        """Годы для фильтра берутся из MIN и MAX, без DISTINCT по датам."""
+        response, queries = self.get(self.url)
+
+        year = str(Post.objects.first().pub_date.year)
+        self.assertContains(response, f'?year={year}')
+        self.assertFalse(any('DISTINCT' in query for query in queries))
+
+    def test_year_filter_filters_by_pub_date_range(self):
+        """Фильтр по году сравнивает pub_date с границами диапазона."""
+        year = Post.objects.first().pub_date.year
+        response, queries = self.get(f'{self.url}?year={year}')
+
+        self.assertEqual(response.context['cl'].result_count, 12)
+        self.assertTrue(any(
+            '"posts_post"."pub_date" >= ' in query
+            and '"posts_post"."pub_date" < ' in query
+            for query in queries
+        ))
+
+    def test_year_filter_ignores_years_out_of_datetime_range(self):
+        """Год вне диапазона datetime не ломает список и не фильтрует."""
+        for year in ('0', '-5', '9999'):
+            with self.subTest(year=year):
+                response, queries = self.get(f'{self.url}?year={year}')
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context['cl'].result_count, 12)
+                self.assertFalse(any(
+                    '"posts_post"."pub_date" >= ' in query
+                    for query in queries
+                ))
@@ -0,0 +1,278 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core import fragment_cache
+
+from ..caching import count_key
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class FeedFragmentCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            group=cls.group,
+            text='Тестовый пост тестового пользователя в тестовой группе',
+        )
+
+    def setUp(self):
+        cache.clear()
+        fragment_cache.stats.reset()
+        self.guest_client = Client()
+        self.auth_client = Client()
+
+        self.auth_client.force_login(FeedFragmentCacheTests.user)
+
+    def get_feed_urls(self):
+        return [
+            reverse('posts:index'),
+            reverse('posts:group_posts', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+        ]
+
+    def test_cached_feed_skips_posts_query(self):
+        """Повторный показ ленты не загружает посты из базы."""
+        for url in self.get_feed_urls():
+            with self.subTest(url=url):
+                first = self.guest_client.get(url)
+                with CaptureQueriesContext(connection) as queries:
+                    second = self.guest_client.get(url)
+
+                self.assertEqual(first.content, second.content)
+                self.assertFalse(any(
+                    query['sql'].startswith('SELECT "posts_post"."id"')
+                    for query in queries.captured_queries
+                ))
+
+    def test_feed_cache_invalidated_on_post_changes(self):
+        """Создание, изменение и удаление поста обновляют ленты."""
+        urls = self.get_feed_urls()
+        for url in urls:
+            self.guest_client.get(url)
+
+        post = Post.objects.create(
+            author=self.user, group=self.group, text='Совсем новый пост'
+        )
+        for url in urls:
+            with self.subTest(url=url, action='create'):
+                self.assertContains(
+                    self.guest_client.get(url), 'Совсем новый пост'
+                )
+
+        post.text = 'Изменённый пост'
+        post.save()
+        for url in urls:
+            with self.subTest(url=url, action='edit'):
+                self.assertContains(
+                    self.guest_client.get(url), 'Изменённый пост'
+                )
+
+        post.delete()
+        for url in urls:
+            with self.subTest(url=url, action='delete'):
+                self.assertNotContains(
+                    self.guest_client.get(url), 'Изменённый пост'
+                )
+
+    def test_feed_cache_invalidated_on_group_change(self):
+        """Изменение группы обновляет ссылки на неё во всех лентах."""
+        urls = self.get_feed_urls()
+        for url in urls:
+            self.guest_client.get(url)
+
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'new-slug'
+        group.save()
+
+        for url in urls[::2]:
+            with self.subTest(url=url):
+                self.assertContains(
+                    self.guest_client.get(url), '/group/new-slug/'
+                )
+
+    def test_feed_cache_varies_on_auth_state(self):
+        """Гость и автор получают разные варианты ленты."""
+        url = reverse('posts:index')
+        edit_url = reverse('posts:post_edit', kwargs={'post_id': self.post.pk})
+
+        self.assertContains(self.auth_client.get(url), edit_url)
+        self.assertNotContains(self.guest_client.get(url), edit_url)
+        self.assertContains(self.auth_client.get(url), edit_url)
+
+    def test_hit_rate_counter(self):
+        """Счётчик попаданий учитывает промахи и попадания в кеш."""
+        url = reverse('posts:index')
+        for _ in range(4):
+            self.guest_client.get(url)
+
+        self.assertEqual(
+            fragment_cache.stats.snapshot(),
+            {'hits': 3, 'misses': 1, 'hit_rate': 0.75}
+        )
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            group=cls.group,
+            text='Тестовый пост тестового пользователя в тестовой группе',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.auth_client = Client()
+
+        self.auth_client.force_login(ConditionalGetTests.user)
+
+    def get_urls(self):
+        return [
+            reverse('posts:index'),
+            reverse('posts:group_posts', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        ]
+
+    def revalidate(self, client, url, response):
+        return client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_page_returns_not_modified(self):
+        """Неизменившаяся страница отдаёт 304 без шаблона."""
+        for url in self.get_urls():
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertIn('ETag', response)
+                self.assertNotIn('Last-Modified', response)
+                self.assertIn('no-cache', response['Cache-Control'])
+
+                revalidated = self.revalidate(
+                    self.guest_client, url, response
+                )
+                self.assertEqual(revalidated.status_code, 304)
+                self.assertEqual(revalidated.templates, [])
+
+    def test_changed_page_returns_full_response(self):
+        """После изменения поста страницы отдаются заново."""
+        urls = self.get_urls()
+        responses = [self.guest_client.get(url) for url in urls]
+
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Изменённый пост'
+        post.save()
+
+        for url, response in zip(urls, responses):
+            with self.subTest(url=url):
+                revalidated = self.revalidate(
+                    self.guest_client, url, response
+                )
+                self.assertEqual(revalidated.status_code, 200)
+
+    def test_author_change_returns_full_response(self):
+        """Переименование автора меняет ETag страниц с его постами."""
+        urls = self.get_urls()
+        responses = [self.guest_client.get(url) for url in urls]
+
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Новое имя'
+        user.save()
+
+        for url, response in zip(urls, responses):
+            with self.subTest(url=url):
+                revalidated = self.revalidate(
+                    self.guest_client, url, response
+                )
+                self.assertEqual(revalidated.status_code, 200)
+
+    def test_login_keeps_validators(self):
+        """Вход пользователя в систему не сбрасывает страницы."""
+        url = reverse('posts:index')
+
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password('password')
+        user.save()
+        response = self.guest_client.get(url)
+        self.assertTrue(
+            self.guest_client.login(username='test_user', password='password')
+        )
+        self.guest_client.logout()
+
+        self.assertEqual(
+            self.revalidate(self.guest_client, url, response).status_code, 304
+        )
+
+    def test_validator_varies_on_auth_state_and_page(self):
+        """ETag зависит от пользователя и номера страницы."""
+        url = reverse('posts:index')
+        response = self.guest_client.get(url)
+
+        self.assertEqual(
+            self.revalidate(self.auth_client, url, response).status_code, 200
+        )
+        self.assertEqual(
+            self.revalidate(
+                self.guest_client, url + '?page=2', response
+            ).status_code,
+            200
+        )
+
+    def test_missing_object_is_not_found(self):
+        """Для несуществующих объектов по-прежнему отдаётся 404."""
+        urls = [
+            reverse('posts:group_posts', kwargs={'slug': 'missing'}),
+            reverse('posts:profile', kwargs={'username': 'missing'}),
+            reverse('posts:post_detail', kwargs={'post_id': 100500}),
+        ]
+
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.guest_client.get(url).status_code, 404)
+
+
+class FeedInvalidationOnCommitTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='test_user')
+        self.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def test_stale_counts_dropped_after_commit(self):
+        """Счётчик, закешированный до фиксации, сбрасывается после неё."""
+        Post.objects.create(author=self.user, text='Старый пост')
+        scopes = ['index', f'author:{self.user.pk}', f'group:{self.group.pk}']
+
+        with transaction.atomic():
+            Post.objects.create(
+                author=self.user, group=self.group, text='Новый пост'
+            )
+            # Читатель, который ещё не видит новый пост.
+            cache.set_many({count_key(scope): 1 for scope in scopes})
+
+        self.assertEqual(cache.get_many(
+            [count_key(scope) for scope in scopes]
+        ), {})
@@ -0,0 +1,214 @@
+import datetime as dt
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import AuthorStats, Group, Post
+from ..search import SearchResults
+
+User = get_user_model()
+
+
+class RebuildAuthorStatsCommandTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.other_user = User.objects.create_user(username='other_user')
+        Post.objects.bulk_create(
+            Post(author=author, text='Тестовый пост')
+            for author in (cls.user, cls.user, cls.other_user)
+        )
+
+    def test_check_reports_broken_counters(self):
+        """Сверка счётчиков сообщает о расхождениях."""
+        with self.assertRaises(CommandError):
+            call_command('rebuild_author_stats', check=True, stdout=StringIO())
+
+    def test_rebuild_restores_counters(self):
+        """Пересчёт восстанавливает счётчики постов авторов."""
+        AuthorStats.objects.create(author=self.user, posts_count=10)
+
+        call_command('rebuild_author_stats', stdout=StringIO())
+
+        self.assertEqual(
+            dict(AuthorStats.objects.values_list('author_id', 'posts_count')),
+            {self.user.pk: 2, self.other_user.pk: 1}
+        )
+        call_command('rebuild_author_stats', check=True, stdout=StringIO())
+
+
+class PostArchiveCommandsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.other_user = User.objects.create_user(username='other_user')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def get_path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write_ndjson(self, name, rows):
+        path = self.get_path(name)
+        with open(path, 'w', encoding='utf-8') as stream:
+            for row in rows:
+                stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+        return path
+
+    def test_import_creates_posts_with_archive_dates(self):
+        """Импорт создаёт посты с датами, авторами и группами из архива."""
+        path = self.write_ndjson('posts.ndjson', [
+            {
+                'text': 'Старый пост',
+                'pub_date': '2015-03-01T12:00:00+00:00',
+                'author': 'test_user',
+                'group': 'test-slug',
+            },
+            {'text': 'Пост без группы', 'author': 'other_user'},
+        ])
+
+        call_command('import_posts', path, stdout=StringIO())
+
+        post = Post.objects.get(text='Старый пост')
+        self.assertEqual(
+            post.pub_date, dt.datetime(2015, 3, 1, 12, tzinfo=timezone.utc)
+        )
+        self.assertEqual(post.author, self.user)
+        self.assertEqual(post.group, self.group)
+        self.assertIsNone(Post.objects.get(text='Пост без группы').group)
+        self.assertTrue(
+            Post._meta.get_field('pub_date').auto_now_add
+        )
+
+    def test_import_skips_invalid_rows(self):
+        """Строки с неизвестным автором, группой или датой пропускаются."""
+        path = self.write_ndjson('posts.ndjson', [
+            {'text': 'Нормальный пост', 'author': 'test_user'},
+            {'text': 'Чужой пост', 'author': 'missing'},
+            {'text': 'Пост', 'author': 'test_user', 'group': 'missing'},
+            {'text': 'Пост', 'author': 'test_user', 'pub_date': 'вчера'},
+            {'text': '', 'author': 'test_user'},
+        ])
+        stderr = StringIO()
+
+        call_command('import_posts', path, stdout=StringIO(), stderr=stderr)
+
+        self.assertEqual(
+            list(Post.objects.values_list('text', flat=True)),
+            ['Нормальный пост']
+        )
+        self.assertEqual(stderr.getvalue().count('пропущена'), 4)
+
+    def test_import_batches_queries(self):
+        """Импорт выполняет постоянное число запросов на пачку."""
+        path = self.write_ndjson('posts.ndjson', [
+            {
+                'text': f'Пост №{i}',
+                'author': ('test_user', 'other_user')[i % 2],
+                'group': 'test-slug',
+            }
+            for i in range(50)
+        ])
+        for author in (self.user, self.other_user):
+            AuthorStats.objects.create(author=author, posts_count=0)
+
+        # Пачка: SAVEPOINT, вставка, обновление счётчиков двух авторов и
+        # RELEASE SAVEPOINT. Авторы и группы ищутся только для первой
+        # пачки, дальше они берутся из кеша команды.
+        with self.assertNumQueries(2 + 5 * 2):
+            call_command(
+                'import_posts', path, batch_size=25, stdout=StringIO()
+            )
+
+        self.assertEqual(Post.objects.count(), 50)
+
+    def test_import_updates_stats_caches_and_search(self):
+        """После импорта обновлены счётчики авторов, ленты и поиск."""
+        AuthorStats.objects.create(author=self.user, posts_count=0)
+        guest_client = Client()
+        guest_client.get(reverse('posts:index'))
+        path = self.write_ndjson('posts.ndjson', [
+            {'text': 'Импортированный пост', 'author': 'test_user'},
+        ])
+
+        call_command('import_posts', path, stdout=StringIO())
+
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).posts_count, 1
+        )
+        self.assertContains(
+            guest_client.get(reverse('posts:index')), 'Импортированный пост'
+        )
+        self.assertEqual(
+            list(SearchResults('импортированный')[:10]),
+            [Post.objects.get()]
+        )
+        call_command('rebuild_author_stats', check=True, stdout=StringIO())
+
+    def test_export_import_round_trip(self):
+        """Выгруженный архив загружается обратно без потерь."""
+        Post.objects.create(author=self.user, group=self.group, text='Пост 1')
+        Post.objects.create(author=self.other_user, text='Пост, "с" кавычками')
+        expected = list(
+            Post.objects.order_by('pk').values_list(
+                'text', 'pub_date', 'author', 'group'
+            )
+        )
+
+        for name in ('posts.csv', 'posts.ndjson'):
+            with self.subTest(name=name):
+                path = self.get_path(name)
+                call_command('export_posts', path, stdout=StringIO())
+                Post.objects.all().delete()
+
+                call_command('import_posts', path, stdout=StringIO())
+
+                self.assertEqual(
+                    list(
+                        Post.objects.order_by('pk').values_list(
+                            'text', 'pub_date', 'author', 'group'
+                        )
+                    ),
+                    expected
+                )
+
+    def test_export_to_stdout(self):
+        """Архив можно вывести в stdout, прогресс при этом идёт в stderr."""
+        Post.objects.create(author=self.user, text='Пост')
+        stdout = StringIO()
+
+        call_command(
+            'export_posts', '-', format='ndjson',
+            stdout=stdout, stderr=StringIO(),
+        )
+
+        row = json.loads(stdout.getvalue())
+        self.assertEqual(row['text'], 'Пост')
+        self.assertEqual(row['author'], 'test_user')
+
+    def test_unknown_format_is_rejected(self):
+        """Без расширения и --format команды сообщают об ошибке."""
+        for command in ('import_posts', 'export_posts'):
+            with self.subTest(command=command):
+                with self.assertRaises(CommandError):
+                    call_command(
+                        command, self.get_path('posts.txt'), stdout=StringIO()
+                    )
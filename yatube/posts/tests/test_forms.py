@@ -1,7 +1,11 @@
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from ..forms import PostForm
 from ..models import Group, Post
 
 User = get_user_model()
@@ -79,3 +83,177 @@ class PostsFormsTests(TestCase):
             Post.objects.get(pk=self.post.pk).text,
             TEST_POST_TEXT_2
         )
+
+    def get_updates(self, form_data):
+        with CaptureQueriesContext(connection) as queries:
+            self.auth_client.post(
+                reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+                data=form_data,
+            )
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "posts_post"')
+        ]
+
+    def test_posts_edit_unchanged_post_skips_write(self):
+        """Сохранение поста без изменений не выполняет UPDATE."""
+        updates = self.get_updates({
+            'text': self.post.text,
+            'group': self.group.pk,
+        })
+
+        self.assertEqual(updates, [])
+
+    def test_posts_edit_updates_changed_fields_only(self):
+        """При изменении текста обновляется только колонка текста."""
+        updates = self.get_updates({
+            'text': TEST_POST_TEXT_2,
+            'group': self.group.pk,
+        })
+
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"text"', updates[0])
+        self.assertNotIn('"group_id"', updates[0])
+        self.assertNotIn('"pub_date"', updates[0])
+
+    def test_posts_edit_by_other_user_is_rejected(self):
+        """Чужой пост не редактируется, а автор поста не загружается."""
+        other_client = Client()
+        other_client.force_login(User.objects.create_user(username='other'))
+        url = reverse('posts:post_edit', kwargs={'post_id': self.post.pk})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = other_client.post(url, data={'text': 'Чужой текст'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            Post.objects.get(pk=self.post.pk).text, self.post.text
+        )
+        self.assertEqual(
+            sum('FROM "auth_user"' in query['sql']
+                for query in queries.captured_queries),
+            1
+        )
+
+
+class PostFormGroupChoicesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        for i in range(30):
+            Group.objects.create(
+                title=f'Группа №{i:02}',
+                slug=f'group-{i}',
+                description='Тестовое описание',
+            )
+        cls.group = Group.objects.get(slug='group-7')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.auth_client = Client()
+
+        self.auth_client.force_login(PostFormGroupChoicesTests.user)
+
+    def group_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.auth_client.get(url)
+        return response, [
+            query['sql'] for query in queries.captured_queries
+            if 'FROM "posts_group"' in query['sql']
+        ]
+
+    def test_group_choices_are_cached(self):
+        """Повторный показ формы не загружает список групп."""
+        url = reverse('posts:post_create')
+        self.group_queries(url)
+
+        response, queries = self.group_queries(url)
+
+        self.assertEqual(queries, [])
+        self.assertContains(response, '<option', count=31)
+
+    def test_group_choices_invalidated_on_group_changes(self):
+        """Изменение и удаление группы обновляют варианты выбора."""
+        url = reverse('posts:post_create')
+        self.group_queries(url)
+
+        group = Group.objects.get(pk=self.group.pk)
+        group.title = 'Переименованная группа'
+        group.save()
+        self.assertContains(self.auth_client.get(url), group.title)
+
+        group.delete()
+        self.assertNotContains(self.auth_client.get(url), group.title)
+
+    def test_cached_choices_still_validate(self):
+        """Форма принимает существующую группу и отклоняет удалённую."""
+        PostForm()
+        form = PostForm(data={'text': 'Пост', 'group': self.group.pk})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['group'], self.group)
+
+        Group.objects.filter(pk=self.group.pk).delete()
+        form = PostForm(data={'text': 'Пост', 'group': self.group.pk})
+        self.assertFalse(form.is_valid())
+
+    @override_settings(POSTS_GROUP_AUTOCOMPLETE=True)
+    def test_autocomplete_widget_renders_selected_group_only(self):
+        """Виджет автодополнения выводит только выбранную группу."""
+        post = Post.objects.create(
+            author=self.user, group=self.group, text='Пост'
+        )
+
+        response, queries = self.group_queries(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk})
+        )
+
+        self.assertEqual(len(queries), 1)
+        self.assertContains(response, '<option', count=2)
+        self.assertContains(response, self.group.title)
+        self.assertContains(
+            response, f'data-lookup-url="{reverse("posts:group_lookup")}"'
+        )
+        self.assertContains(response, 'js/group_autocomplete.js')
+
+    def test_group_lookup_requires_login(self):
+        """Поиск групп доступен только авторизованным, как и форма."""
+        response = self.guest_client.get(reverse('posts:group_lookup'))
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_group_lookup_by_prefix_with_limit(self):
+        """Поиск групп отдаёт JSON с группами по началу названия."""
+        url = reverse('posts:group_lookup')
+
+        response = self.auth_client.get(url, {'q': 'группа №1'})
+        results = response.json()['results']
+        self.assertEqual(
+            [group['title'] for group in results],
+            [f'Группа №{i}' for i in range(10, 20)]
+        )
+        self.assertEqual(
+            set(results[0]), {'id', 'slug', 'title'}
+        )
+
+        response = self.auth_client.get(url, {'limit': 1000})
+        self.assertEqual(len(response.json()['results']), 20)
+
+        response = self.auth_client.get(url, {'q': 'Нет такой'})
+        self.assertEqual(response.json(), {'results': []})
+
+    def test_group_lookup_uses_title_key_index(self):
+        """Поиск по началу названия читает группы по индексу."""
+        with CaptureQueriesContext(connection) as queries:
+            self.auth_client.get(
+                reverse('posts:group_lookup'), {'q': 'ГРУППА №2'}
+            )
+        sql = next(
+            query['sql'] for query in queries.captured_queries
+            if 'FROM "posts_group"' in query['sql']
+        )
+
+        with connection.cursor() as cursor:
+            plan = cursor.execute(f'EXPLAIN QUERY PLAN {sql}').fetchall()
+        self.assertIn('SEARCH posts_group USING INDEX', plan[0][-1])
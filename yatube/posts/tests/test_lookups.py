@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.http import Http404
+from django.test import TestCase
+
+from ..caching import invalidate_groups
+from ..lookups import authors, groups
+from ..models import Group
+
+User = get_user_model()
+
+
+class ModelLookupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.user = User.objects.create_user(username='test_user')
+
+    def setUp(self):
+        groups.cache.clear()
+        authors.cache.clear()
+
+    def test_found_object_is_cached(self):
+        """Повторный поиск группы не обращается к базе."""
+        first = groups.get('test-slug')
+
+        with self.assertNumQueries(0):
+            second = groups.get('test-slug')
+
+        self.assertEqual(second, self.group)
+        self.assertEqual(second.title, self.group.title)
+        self.assertIsNot(first, second)
+
+    def test_missing_object_is_cached(self):
+        """Отсутствующий slug кешируется и отвечает 404 без запроса."""
+        with self.assertRaises(Http404):
+            groups.get_or_404('missing')
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(groups.get('missing'))
+
+    def test_saved_group_is_invalidated(self):
+        """Создание и переименование группы сбрасывают её записи."""
+        self.assertIsNone(groups.get('new-slug'))
+        groups.get('test-slug')
+
+        self.group.slug = 'new-slug'
+        self.group.save()
+
+        self.assertEqual(groups.get('new-slug'), self.group)
+        self.assertIsNone(groups.get('test-slug'))
+
+    def test_saved_author_is_invalidated(self):
+        """Изменение и удаление пользователя сбрасывают его запись."""
+        authors.get('test_user')
+
+        self.user.first_name = 'Иван'
+        self.user.save()
+        self.assertEqual(authors.get('test_user').first_name, 'Иван')
+
+        self.user.delete()
+        self.assertIsNone(authors.get('test_user'))
+
+    def test_entry_of_old_generation_is_reloaded(self):
+        """Изменение в другом процессе сбрасывает запись через поколение."""
+        groups.get('test-slug')
+        # Другой воркер переименовал группу: его сигнал увеличил
+        # поколение в общем кеше, а кеш этого процесса не тронул.
+        Group.objects.filter(pk=self.group.pk).update(title='Новое название')
+        invalidate_groups()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(groups.get('test-slug').title, 'Новое название')
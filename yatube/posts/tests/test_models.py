@@ -1,7 +1,16 @@
+from io import StringIO
+from unittest import mock
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-from ..models import Group, Post
+from .. import tasks
+from ..models import EXCERPT_LENGTH, AuthorStats, Group, Post, make_excerpt
+from ..rendering import RENDERER_VERSION
 
 User = get_user_model()
 
@@ -69,3 +78,189 @@ class PostsModelTests(TestCase):
                 self.assertEqual(
                     post._meta.get_field(field).help_text, expected_help_text
                 )
+
+
+class AuthorStatsModelTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.other_user = User.objects.create_user(username='other_user')
+
+    def get_count(self, user):
+        return AuthorStats.objects.get(author=user).posts_count
+
+    def test_counter_follows_created_and_deleted_posts(self):
+        """Счётчик постов автора меняется при создании и удалении поста."""
+        user = AuthorStatsModelTests.user
+        posts = [
+            Post.objects.create(author=user, text=f'Пост №{i}')
+            for i in range(3)
+        ]
+        self.assertEqual(self.get_count(user), 3)
+
+        posts[0].delete()
+        self.assertEqual(self.get_count(user), 2)
+
+    def test_counter_follows_author_change(self):
+        """При смене автора пост переходит в счётчик нового автора."""
+        user = AuthorStatsModelTests.user
+        other_user = AuthorStatsModelTests.other_user
+        post = Post.objects.create(author=user, text='Пост')
+        Post.objects.create(author=other_user, text='Другой пост')
+
+        post.author = other_user
+        post.save()
+
+        self.assertEqual(self.get_count(user), 0)
+        self.assertEqual(self.get_count(other_user), 2)
+
+    def test_missing_counter_falls_back_to_count(self):
+        """Без строки статистики количество постов считается запросом."""
+        user = AuthorStatsModelTests.user
+        Post.objects.create(author=user, text='Пост')
+        AuthorStats.objects.filter(author=user).delete()
+        user = User.objects.get(pk=user.pk)
+
+        self.assertEqual(AuthorStats.get_posts_count(user), 1)
+
+
+class PostExcerptTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.long_text = 'Очень длинный пост. ' * 100
+        cls.post = Post.objects.create(
+            author=cls.user, group=cls.group, text=cls.long_text
+        )
+
+    def test_make_excerpt_cuts_on_word_boundary(self):
+        """Анонс обрезается по границе слова и помечается многоточием."""
+        excerpt = make_excerpt(self.long_text)
+
+        self.assertLessEqual(len(excerpt), EXCERPT_LENGTH + 1)
+        self.assertTrue(excerpt.endswith('пост.…'))
+        self.assertTrue(self.long_text.startswith(excerpt[:-1]))
+        self.assertEqual(make_excerpt('Короткий пост'), 'Короткий пост')
+
+    def test_excerpt_maintained_on_save(self):
+        """Анонс обновляется при сохранении текста, в том числе частичном."""
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.excerpt, make_excerpt(self.long_text))
+
+        post.text = 'Новый текст'
+        post.save(update_fields=['text'])
+        self.assertEqual(
+            Post.objects.get(pk=post.pk).excerpt, 'Новый текст'
+        )
+
+    def test_list_views_do_not_load_full_text(self):
+        """Ленты выводят анонс и не читают полный текст постов."""
+        urls = [
+            reverse('posts:index'),
+            reverse('posts:group_posts', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+            reverse('posts:search') + '?q=пост',
+        ]
+        client = Client()
+
+        for url in urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(url)
+
+                self.assertContains(response, self.post.excerpt)
+                self.assertNotContains(response, self.long_text.strip())
+                self.assertFalse(any(
+                    '"posts_post"."text"' in query['sql']
+                    and 'MATCH' not in query['sql']
+                    for query in queries.captured_queries
+                ))
+
+    def test_post_detail_shows_full_text(self):
+        """Страница поста выводит полный текст."""
+        response = Client().get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+
+        self.assertContains(response, self.long_text.strip())
+
+
+class PostRenderingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+
+    def setUp(self):
+        tasks._rerender_scheduled_at = None
+
+    def make_stale(self, text):
+        # Так выглядят посты, сохранённые прошлой версией правил.
+        post = Post.objects.create(author=self.user, text=text)
+        Post.objects.filter(pk=post.pk).update(
+            text_html='устаревший', excerpt_html='устаревший',
+            render_version=RENDERER_VERSION - 1,
+        )
+        return Post.objects.get(pk=post.pk)
+
+    def test_html_rendered_on_save(self):
+        """HTML текста и анонса сохраняется вместе с постом."""
+        post = Post.objects.create(
+            author=self.user, text='<b>Первая</b>\nвторая'
+        )
+
+        post = Post.objects.get(pk=post.pk)
+        self.assertEqual(
+            post.text_html, '&lt;b&gt;Первая&lt;/b&gt;<br>вторая'
+        )
+        self.assertEqual(post.excerpt_html, post.text_html)
+        self.assertEqual(post.render_version, RENDERER_VERSION)
+        self.assertEqual(post.rendered_text, post.text_html)
+
+        post.text = 'Новый\nтекст'
+        post.save(update_fields=['text'])
+        self.assertEqual(
+            Post.objects.get(pk=post.pk).text_html, 'Новый<br>текст'
+        )
+
+    def test_stale_html_rendered_on_the_fly_and_scheduled(self):
+        """Устаревший HTML не показывается, а перерисовка ставится в фон."""
+        post = self.make_stale('Строка\nстрока')
+
+        with mock.patch.object(tasks, 'enqueue_on_commit') as enqueue:
+            self.assertEqual(post.rendered_text, 'Строка<br>строка')
+            self.assertEqual(post.rendered_excerpt, 'Строка<br>строка')
+
+        enqueue.assert_called_once_with(tasks.rerender_stale_posts)
+
+    def test_rerender_task_updates_stale_posts_only(self):
+        """Фоновая задача перерисовывает только устаревшие посты."""
+        stale = self.make_stale('Старый\nпост')
+        fresh = Post.objects.create(author=self.user, text='Свежий пост')
+
+        with self.assertNumQueries(2):
+            tasks.rerender_stale_posts()
+
+        stale = Post.objects.get(pk=stale.pk)
+        self.assertEqual(stale.text_html, 'Старый<br>пост')
+        self.assertEqual(stale.render_version, RENDERER_VERSION)
+        self.assertEqual(
+            Post.objects.get(pk=fresh.pk).text_html, 'Свежий пост'
+        )
+
+    def test_rerender_posts_command(self):
+        """Команда rerender_posts перерисовывает устаревшие посты."""
+        stale = self.make_stale('Старый пост')
+        out = StringIO()
+
+        call_command('rerender_posts', stdout=out)
+
+        self.assertIn('1', out.getvalue())
+        self.assertTrue(Post.objects.get(pk=stale.pk).is_rendered)
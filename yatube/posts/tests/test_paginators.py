@@ -0,0 +1,203 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post
+from ..paginators import CursorPaginator, decode_cursor, encode_cursor
+
+User = get_user_model()
+
+
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        posts = Post.objects.bulk_create(
+            Post(author=cls.user, text=f'Тестовый пост №{i}')
+            for i in range(25)
+        )
+        # Одинаковая дата у всех постов: порядок задаёт только id.
+        Post.objects.update(pub_date=posts[0].pub_date)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_cursor_round_trip(self):
+        """Курсор кодирует дату публикации и id без потерь."""
+        post = Post.objects.first()
+
+        self.assertEqual(
+            decode_cursor(encode_cursor(post)),
+            (post.pub_date, post.pk)
+        )
+
+    def test_cursor_before_epoch(self):
+        """Курсор поста, опубликованного до 1970 года, тоже читается."""
+        post = Post.objects.first()
+        post.pub_date = post.pub_date.replace(year=1969)
+
+        self.assertEqual(
+            decode_cursor(encode_cursor(post)),
+            (post.pub_date, post.pk)
+        )
+
+    def test_invalid_cursor_returns_first_page(self):
+        """Некорректный курсор открывает первую страницу."""
+        paginator = CursorPaginator(Post.objects.all(), 10)
+
+        for cursor in ('', 'abc', '1-2-3', '10--5', '1_2_3', '10_-5',
+                       '99999999999999999999_1'):
+            with self.subTest(cursor=cursor):
+                page = paginator.get_page_after(cursor)
+                self.assertIsNone(page.cursor)
+                self.assertEqual(len(page), 10)
+
+    def test_cursor_pages_walk_whole_feed(self):
+        """Проход по курсорам выдаёт все посты без пропусков и повторов."""
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        expected = list(
+            Post.objects.order_by('-pub_date', '-pk').values_list(
+                'pk', flat=True
+            )
+        )
+
+        seen = []
+        page = paginator.get_page_after(None)
+        while True:
+            seen.extend(post.pk for post in page)
+            if not page.has_next():
+                break
+            page = paginator.get_page_after(page.next_cursor)
+
+        self.assertEqual(seen, expected)
+
+    def test_cursor_page_is_page_compatible(self):
+        """Страница по курсору совместима с Page и шаблоном паджинатора."""
+        response = self.guest_client.get(reverse('posts:index') + '?after=')
+        page_obj = response.context['page_obj']
+
+        self.assertIsInstance(page_obj, Page)
+        self.assertIsInstance(page_obj.paginator, Paginator)
+        self.assertTrue(page_obj.has_next())
+        self.assertContains(response, f'?after={page_obj.next_cursor}')
+
+    def test_cursor_page_skips_count_and_offset(self):
+        """Страница по курсору не выполняет COUNT и OFFSET."""
+        post = Post.objects.order_by('-pub_date', '-pk')[15]
+        paginator = CursorPaginator(Post.objects.all(), 10)
+
+        with self.assertNumQueries(1) as queries:
+            page = paginator.get_page_after(encode_cursor(post))
+            list(page)
+
+        sql = queries.captured_queries[0]['sql'].upper()
+        self.assertNotIn('COUNT(', sql)
+        self.assertNotIn('OFFSET', sql)
+        self.assertEqual(len(page), 9)
+        self.assertFalse(page.has_next())
+
+
+class CachedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(12):
+            Post.objects.create(
+                author=cls.user, group=cls.group, text=f'Тестовый пост №{i}'
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def get_feed_urls(self):
+        return [
+            reverse('posts:index'),
+            reverse('posts:group_posts', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+        ]
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.guest_client.get(url)
+        return response, [
+            query['sql'] for query in queries.captured_queries
+            if 'COUNT(' in query['sql']
+        ]
+
+    def test_feed_count_is_cached(self):
+        """Повторный запрос ленты не выполняет COUNT(*)."""
+        for url in self.get_feed_urls():
+            with self.subTest(url=url):
+                self.count_queries(url)
+                response, counts = self.count_queries(url)
+
+                self.assertEqual(counts, [])
+                self.assertEqual(
+                    response.context['page_obj'].paginator.count, 12
+                )
+
+    def test_feed_count_invalidated_on_create_and_delete(self):
+        """Создание и удаление поста сбрасывают закешированное количество."""
+        urls = self.get_feed_urls()
+        for url in urls:
+            self.count_queries(url)
+
+        post = Post.objects.create(
+            author=self.user, group=self.group, text='Новый пост'
+        )
+        for url in urls:
+            with self.subTest(url=url, action='create'):
+                response, _ = self.count_queries(url)
+                self.assertEqual(
+                    response.context['page_obj'].paginator.count, 13
+                )
+
+        post.delete()
+        for url in urls:
+            with self.subTest(url=url, action='delete'):
+                response, _ = self.count_queries(url)
+                self.assertEqual(
+                    response.context['page_obj'].paginator.count, 12
+                )
+
+    def test_feed_count_invalidated_on_group_change(self):
+        """Смена группы поста сбрасывает количество в обеих группах."""
+        other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-slug',
+            description='Тестовое описание',
+        )
+        group_url = reverse(
+            'posts:group_posts', kwargs={'slug': self.group.slug}
+        )
+        self.count_queries(group_url)
+
+        post = Post.objects.filter(group=self.group).first()
+        post.group = other_group
+        post.save()
+
+        response, _ = self.count_queries(group_url)
+        self.assertEqual(response.context['page_obj'].paginator.count, 11)
+
+    @override_settings(POSTS_COUNT_ESTIMATE_THRESHOLD=1)
+    def test_large_table_uses_estimated_count(self):
+        """Для большой таблицы главная лента берёт оценку вместо COUNT."""
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        response, counts = self.count_queries(reverse('posts:index'))
+
+        self.assertEqual(counts, [])
+        self.assertEqual(response.context['page_obj'].paginator.count, 12)
@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, Post
+from ..urls import urlpatterns
+from .utils import query_budget
+
+User = get_user_model()
+
+# Бюджет запросов для авторизованного пользователя, включая сессию и
+# загрузку самого пользователя, при пустом кеше. Не должен зависеть от
+# числа постов.
+QUERY_BUDGETS = {
+    'index': 5,
+    'group_posts': 6,
+    'profile': 5,
+    'post_detail': 4,
+    'post_create': 3,
+    'post_edit': 4,
+    'search': 5,
+    'group_lookup': 3,
+}
+
+
+class PostsQueryBudgetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(12):
+            author = User.objects.create_user(username=f'author_{i}')
+            group = Group.objects.create(
+                title=f'Группа №{i}',
+                slug=f'group-{i}',
+                description='Тестовое описание',
+            )
+            Post.objects.create(author=author, group=group, text=f'Пост №{i}')
+            Post.objects.create(
+                author=cls.user, group=cls.group, text=f'Пост автора №{i}'
+            )
+        cls.post = Post.objects.filter(author=cls.user).first()
+
+    def setUp(self):
+        cache.clear()
+        self.auth_client = Client()
+
+        self.auth_client.force_login(PostsQueryBudgetTests.user)
+
+    def get_urls(self):
+        return {
+            'index': reverse('posts:index'),
+            'group_posts': reverse(
+                'posts:group_posts', kwargs={'slug': self.group.slug}
+            ),
+            'profile': reverse(
+                'posts:profile', kwargs={'username': self.user.username}
+            ),
+            'post_detail': reverse(
+                'posts:post_detail', kwargs={'post_id': self.post.pk}
+            ),
+            'post_create': reverse('posts:post_create'),
+            'post_edit': reverse(
+                'posts:post_edit', kwargs={'post_id': self.post.pk}
+            ),
+            'search': reverse('posts:search') + '?q=Пост',
+            'group_lookup': reverse('posts:group_lookup') + '?q=Гр',
+        }
+
+    def test_every_view_has_query_budget(self):
+        """У каждого URL приложения Posts задан бюджет запросов."""
+        names = {pattern.name for pattern in urlpatterns}
+
+        self.assertEqual(names, set(QUERY_BUDGETS))
+
+    def test_views_fit_query_budget(self):
+        """Страницы приложения Posts укладываются в бюджет запросов."""
+        for name, url in self.get_urls().items():
+            with self.subTest(name=name):
+                with query_budget(QUERY_BUDGETS[name]):
+                    response = self.auth_client.get(url)
+                self.assertEqual(response.status_code, 200)
@@ -0,0 +1,74 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post
+from ..paginators import encode_cursor
+
+User = get_user_model()
+
+# Полный проход по таблице без индекса или сортировка во временном B-tree.
+BAD_PLAN_PATTERNS = (
+    re.compile(r'^SCAN (TABLE )?posts_post(?! USING (COVERING )?INDEX)'),
+    re.compile(r'USE TEMP B-TREE'),
+)
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class PostsQueryPlanTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, group=cls.group, text=f'Тестовый пост №{i}')
+            for i in range(15)
+        )
+        cls.cursor = Post.objects.order_by('-pub_date', '-pk')[4]
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def feed_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.guest_client.get(url)
+            self.assertEqual(response.status_code, 200)
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+            and '"posts_post"' in query['sql']
+        ]
+
+    def test_feed_queries_use_indexes(self):
+        """Запросы лент не делают полный проход и сортировку без индекса."""
+        feeds = [
+            reverse('posts:index'),
+            reverse('posts:group_posts', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+        ]
+        cursor = encode_cursor(self.cursor)
+
+        for feed in feeds:
+            for url in (feed, f'{feed}?page=2', f'{feed}?after={cursor}'):
+                for sql in self.feed_queries(url):
+                    with self.subTest(url=url, sql=sql):
+                        plan = explain(sql)
+                        for pattern in BAD_PLAN_PATTERNS:
+                            self.assertFalse(
+                                any(pattern.search(step) for step in plan),
+                                f'{plan}'
+                            )
@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from ..models import Group, Post
+from ..rows import FeedRow
+
+User = get_user_model()
+
+
+class FeedRowTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='test_user', first_name='Иван', last_name='Петров'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.user, group=cls.group, text=f'Пост №{i}'
+            )
+            for i in range(3)
+        ]
+        Post.objects.create(author=cls.user, text='Пост без группы')
+
+    def test_rows_fetched_in_one_query(self):
+        """Строки ленты с автором и группой читаются одним запросом."""
+        with self.assertNumQueries(1):
+            rows = list(Post.objects.feed_rows())
+
+        self.assertTrue(all(isinstance(row, FeedRow) for row in rows))
+        self.assertIsNone(rows[0].group)
+        row = rows[1]
+        self.assertEqual(row.author.username, 'test_user')
+        self.assertEqual(row.author.get_full_name(), 'Иван Петров')
+        self.assertEqual(str(row.group), 'Тестовая группа')
+        self.assertEqual(row.group.slug, 'test-slug')
+        self.assertEqual(row.rendered_excerpt, self.posts[-1].excerpt_html)
+
+    def test_related_rows_are_shared(self):
+        """Автор и группа создаются один раз на выборку."""
+        rows = list(Post.objects.filter(group=self.group).feed_rows())
+
+        self.assertIs(rows[0].author, rows[1].author)
+        self.assertIs(rows[0].group, rows[2].group)
+
+    def test_row_has_feed_fields_only(self):
+        """Строка несёт поля ленты, а не полный текст поста."""
+        post = self.posts[0]
+        row = Post.objects.feed_rows().get(pk=post.pk)
+
+        self.assertEqual(
+            (row.pk, row.pub_date, row.excerpt),
+            (post.pk, post.pub_date, post.excerpt)
+        )
+        self.assertFalse(hasattr(row, 'text'))
+
+    def test_urls_match_models(self):
+        """Адреса строк совпадают с адресами поста, автора и группы."""
+        post = self.posts[0]
+        row = Post.objects.feed_rows().get(pk=post.pk)
+
+        with self.assertNumQueries(0):
+            urls = [
+                row.get_absolute_url(),
+                row.get_edit_url(),
+                row.author.get_absolute_url(),
+                row.group.get_absolute_url(),
+            ]
+        self.assertEqual(urls, [
+            post.get_absolute_url(),
+            post.get_edit_url(),
+            self.user.get_absolute_url(),
+            self.group.get_absolute_url(),
+        ])
+        self.assertEqual(urls, [
+            f'/posts/{post.pk}/',
+            f'/posts/{post.pk}/edit/',
+            '/profile/test_user/',
+            '/group/test-slug/',
+        ])
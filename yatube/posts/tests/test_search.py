@@ -0,0 +1,114 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Post
+from ..search import SEARCH_TABLE, SearchResults
+
+User = get_user_model()
+
+
+class PostSearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Кот сидит на окне и смотрит на улицу',
+        )
+        cls.relevant_post = Post.objects.create(
+            author=cls.user,
+            text='Кот и ещё один кот: пост про котов и кошек',
+        )
+        cls.other_post = Post.objects.create(
+            author=cls.user,
+            text='Собака гуляет во дворе',
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def search(self, query):
+        return list(SearchResults(query)[:10])
+
+    def test_results_are_ranked(self):
+        """Более релевантные посты идут первыми."""
+        self.assertEqual(self.search('кот'), [
+            PostSearchTests.relevant_post, PostSearchTests.post,
+        ])
+
+    def test_prefix_and_case_insensitive_match(self):
+        """Поиск находит слова по началу без учёта регистра."""
+        self.assertEqual(self.search('СОБАК'), [PostSearchTests.other_post])
+        self.assertEqual(self.search('кот окне'), [PostSearchTests.post])
+
+    def test_empty_query_returns_nothing(self):
+        """Пустой запрос и запрос из знаков препинания ничего не находят."""
+        for query in ('', '   ', '"*:()'):
+            with self.subTest(query=query):
+                self.assertEqual(SearchResults(query).count(), 0)
+                self.assertEqual(self.search(query), [])
+
+    def test_index_follows_post_changes(self):
+        """Индекс обновляется при создании, изменении и удалении поста."""
+        post = Post.objects.create(author=self.user, text='Попугай говорит')
+        self.assertEqual(self.search('попугай'), [post])
+
+        post.text = 'Хомяк спит'
+        post.save()
+        self.assertEqual(self.search('попугай'), [])
+        self.assertEqual(self.search('хомяк'), [post])
+
+        Post.objects.filter(pk=post.pk).update(text='Черепаха ползёт')
+        self.assertEqual(self.search('хомяк'), [])
+        self.assertEqual(self.search('черепаха'), [post])
+
+        post.delete()
+        self.assertEqual(self.search('черепаха'), [])
+
+    def test_search_page_paginates_and_keeps_query(self):
+        """Страница поиска показывает результаты и сохраняет запрос."""
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'Кот номер {i}') for i in range(12)
+        )
+        url = reverse('posts:search')
+
+        response = self.guest_client.get(url, {'q': 'кот'})
+        page_obj = response.context['page_obj']
+
+        self.assertEqual(page_obj.paginator.count, 14)
+        self.assertEqual(len(page_obj), 10)
+        self.assertContains(response, '?q=%D0%BA%D0%BE%D1%82&amp;page=2')
+
+        response = self.guest_client.get(url, {'q': 'кот', 'page': 2})
+        self.assertEqual(len(response.context['page_obj']), 4)
+
+    def test_search_query_uses_fts_index(self):
+        """Поиск выполняется по индексу FTS5, а не перебором постов."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'EXPLAIN QUERY PLAN SELECT rowid FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s ORDER BY rank',
+                ['"кот"*'],
+            )
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+
+        self.assertIn('VIRTUAL TABLE INDEX', plan)
+
+    def test_rebuild_command_restores_index(self):
+        """Команда rebuild_search_index заполняет индекс заново."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) "
+                "VALUES ('delete-all')"
+            )
+        self.assertEqual(self.search('собака'), [])
+
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        self.assertEqual(self.search('собака'), [PostSearchTests.other_post])
@@ -87,7 +87,7 @@ class PostsViewsTests(TestCase):
         context_post = response.context['page_obj'][0]
         post_author = context_post.author.username
         post_group = context_post.group.title
-        post_text = context_post.text
+        post_text = context_post.excerpt
 
         self.assertEqual(post_author, 'test_user')
         self.assertEqual(post_group, 'Тестовая группа')
@@ -106,7 +106,7 @@ class PostsViewsTests(TestCase):
         context_post = response.context['page_obj'][0]
         post_author = context_post.author.username
         post_group = context_post.group.title
-        post_text = context_post.text
+        post_text = context_post.excerpt
         context_group = response.context['group'].title
 
         self.assertEqual(post_author, 'test_user')
@@ -128,7 +128,7 @@ class PostsViewsTests(TestCase):
         context_post = response.context['page_obj'][0]
         post_author = context_post.author.username
         post_group = context_post.group.title
-        post_text = context_post.text
+        post_text = context_post.excerpt
         context_author = response.context['author'].username
         context_posts_count = response.context['posts_count']
 
@@ -240,7 +240,7 @@ class PostsViewsTests(TestCase):
                 response = self.auth_client.get(page)
                 context_post = response.context['page_obj'][0]
 
-                self.assertEqual(context_post, post)
+                self.assertEqual(context_post.pk, post.pk)
 
     def test_post_correct_not_appear(self):
         ("""Проверка, что созданный пост не появляется в группе """
@@ -252,4 +252,4 @@ class PostsViewsTests(TestCase):
         response = self.auth_client.get(page)
         context_post = response.context['page_obj'][0]
 
-        self.assertNotEqual(context_post, post)
+        self.assertNotEqual(context_post.pk, post.pk)
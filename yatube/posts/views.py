@@ -1,76 +1,175 @@
-from django.contrib.auth import get_user_model
+from urllib.parse import urlencode
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
+from django.db import transaction
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
+from . import lookups
+from .caching import conditional_page, count_posts, feed_namespaces
 from .forms import PostForm
-from .models import Group, Post
-
-User = get_user_model()
+from .models import AuthorStats, Group, Post, make_title_key
+from .paginators import CachedCountPaginator, CursorPaginator
+from .search import SearchResults
 
 SHOW_POSTS = 10
+GROUP_LOOKUP_LIMIT = 20
+
+
+def paginate(request, posts, scope, count_func=None):
+    cursor = request.GET.get('after')
+
+    if cursor is not None:
+        return CursorPaginator(posts, SHOW_POSTS).get_page_after(cursor)
+
+    paginator = CachedCountPaginator(posts, SHOW_POSTS, scope, count_func)
+    page_number = request.GET.get('page')
+    return paginator.get_page(page_number)
+
+
+def index_namespaces(request):
+    return feed_namespaces('index')
 
 
+def group_namespaces(request, slug):
+    group = lookups.groups.get(slug)
+    if group is None:
+        return None
+    return feed_namespaces(f'group:{group.pk}')
+
+
+def profile_namespaces(request, username):
+    author = lookups.authors.get(username)
+    if author is None:
+        return None
+    return feed_namespaces(f'author:{author.pk}')
+
+
+def post_detail_namespaces(request, post_id):
+    # Сохранение поста сбрасывает пространство имён его автора, а от него
+    # зависит и счётчик постов на странице.
+    author_id = (
+        Post.objects.filter(pk=post_id)
+        .values_list('author_id', flat=True)
+        .first()
+    )
+    if author_id is None:
+        return None
+    return feed_namespaces(f'author:{author_id}')
+
+
+@conditional_page(index_namespaces)
 def index(request):
     template = 'posts/index.html'
-    posts_all = Post.objects.all()
+    posts_all = Post.objects.feed_rows()
 
-    paginator = Paginator(posts_all, SHOW_POSTS)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate(request, posts_all, 'index', count_posts)
 
     context = {
-        'page_obj': page_obj
+        'page_obj': page_obj,
+        'cache_namespaces': feed_namespaces('index'),
     }
-    return render(request, template, context)
+    return render(
+        request, template, context, using=settings.POSTS_TEMPLATE_ENGINE
+    )
 
 
+@conditional_page(group_namespaces)
 def group_posts(request, slug):
     template = 'posts/group_list.html'
-    group = get_object_or_404(Group, slug=slug)
-    posts_all = group.posts.all()
+    group = lookups.groups.get_or_404(slug)
+    posts_all = group.posts.feed_rows()
 
-    paginator = Paginator(posts_all, SHOW_POSTS)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    scope = f'group:{group.pk}'
+    page_obj = paginate(request, posts_all, scope)
 
     context = {
         'group': group,
         'page_obj': page_obj,
+        'cache_namespaces': feed_namespaces(scope),
     }
-    return render(request, template, context)
+    return render(
+        request, template, context, using=settings.POSTS_TEMPLATE_ENGINE
+    )
 
 
+@conditional_page(profile_namespaces)
 def profile(request, username):
     template = 'posts/profile.html'
-    author = get_object_or_404(User, username=username)
-    posts_all = author.posts.all()
-    posts_count = author.posts.count()
+    author = lookups.authors.get_or_404(username)
+    posts_all = author.posts.feed_rows()
+    posts_count = AuthorStats.get_posts_count(author)
 
-    paginator = Paginator(posts_all, SHOW_POSTS)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    scope = f'author:{author.pk}'
+    page_obj = paginate(request, posts_all, scope, lambda: posts_count)
 
     context = {
         'author': author,
         'posts_count': posts_count,
         'page_obj': page_obj,
+        'cache_namespaces': feed_namespaces(scope),
     }
-    return render(request, template, context)
+    return render(
+        request, template, context, using=settings.POSTS_TEMPLATE_ENGINE
+    )
 
 
+@conditional_page(post_detail_namespaces)
 def post_detail(request, post_id):
     template = 'posts/post_detail.html'
-    post = get_object_or_404(Post, pk=post_id)
-    posts_count = post.author.posts.count()
+    post = get_object_or_404(
+        Post.objects.for_feed().select_related('author__post_stats'),
+        pk=post_id,
+    )
+    posts_count = AuthorStats.get_posts_count(post.author)
 
     context = {
         'post': post,
         'posts_count': posts_count,
     }
+    return render(
+        request, template, context, using=settings.POSTS_TEMPLATE_ENGINE
+    )
+
+
+def search(request):
+    template = 'posts/search.html'
+    query = request.GET.get('q', '').strip()
+
+    paginator = Paginator(SearchResults(query), SHOW_POSTS)
+    page_obj = paginator.get_page(request.GET.get('page'))
+
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+        'page_query': urlencode({'q': query}) + '&',
+    }
     return render(request, template, context)
 
 
+@login_required
+def group_lookup(request):
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = int(request.GET.get('limit', GROUP_LOOKUP_LIMIT))
+    except ValueError:
+        limit = GROUP_LOOKUP_LIMIT
+    limit = max(1, min(limit, GROUP_LOOKUP_LIMIT))
+
+    groups = Group.objects.order_by('title_key', 'pk')
+    if query:
+        # Все строки с этим началом лежат в диапазоне [key, key + U+10FFFF),
+        # и он читается по индексу title_key.
+        key = make_title_key(query)
+        groups = groups.filter(
+            title_key__gte=key, title_key__lt=key + '\U0010ffff'
+        )
+    results = list(groups.values('id', 'slug', 'title')[:limit])
+    return JsonResponse({'results': results})
+
+
 @login_required
 def post_create(request):
     form = PostForm(request.POST or None)
@@ -80,7 +179,8 @@ def post_create(request):
         if form.is_valid():
             post_temp = form.save(commit=False)
             post_temp.author = request.user
-            post_temp.save()
+            with transaction.atomic():
+                post_temp.save()
             return redirect('posts:profile', username=request.user.username)
 
     return render(request, 'posts/create_post.html', {'form': form})
@@ -90,7 +190,7 @@ def post_create(request):
 def post_edit(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
 
-    if request.user != post.author:
+    if post.author_id != request.user.pk:
         return redirect('/posts/' + str(post_id))
 
     form = PostForm(request.POST or None, instance=post)
@@ -98,7 +198,12 @@ def post_edit(request, post_id):
     if request.method == 'POST':
 
         if form.is_valid():
-            form.save()
+            # Без изменений пост не перезаписывается, иначе обновляются
+            # только изменённые колонки.
+            if form.has_changed():
+                post = form.save(commit=False)
+                with transaction.atomic():
+                    post.save(update_fields=form.changed_data)
             return redirect('/posts/' + str(post_id))
 
     return render(request, 'posts/create_post.html', {
@@ -0,0 +1,57 @@
+// Подгружает группы в список выбора по мере ввода названия.
+(function () {
+  'use strict';
+
+  var DELAY = 250;
+
+  function setup(select) {
+    var input = document.createElement('input');
+    input.type = 'search';
+    input.className = 'form-control mb-2';
+    input.placeholder = 'Начните вводить название группы';
+    input.setAttribute('aria-controls', select.id);
+    select.parentNode.insertBefore(input, select);
+
+    var timer = null;
+    var request = 0;
+
+    function render(results) {
+      var selected = select.value;
+      var keep = Array.prototype.filter.call(select.options, function (option) {
+        return option.value === '' || option.value === selected;
+      });
+      select.innerHTML = '';
+      keep.forEach(function (option) { select.appendChild(option); });
+      results.forEach(function (group) {
+        if (String(group.id) === selected) {
+          return;
+        }
+        var option = document.createElement('option');
+        option.value = group.id;
+        option.textContent = group.title;
+        select.appendChild(option);
+      });
+    }
+
+    function lookup() {
+      var current = ++request;
+      var url = select.dataset.lookupUrl + '?q=' + encodeURIComponent(input.value);
+      fetch(url, {credentials: 'same-origin'})
+        .then(function (response) { return response.json(); })
+        .then(function (data) {
+          if (current === request) {
+            render(data.results);
+          }
+        });
+    }
+
+    input.addEventListener('input', function () {
+      clearTimeout(timer);
+      timer = setTimeout(lookup, DELAY);
+    });
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('select[data-lookup-url]').forEach(setup);
+  });
+})();
@@ -0,0 +1,180 @@
+import os
+
+from django.utils.module_loading import import_string
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+SECRET_KEY = '442qbv!4*l_k0up9k$#0#8dl2q(b9_qvhvd98r2q7*oal8nnww'
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    '127.0.0.1',
+    'testserver',
+]
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'posts.apps.PostsConfig',
+    'users.apps.UsersConfig',
+    'core.apps.CoreConfig',
+    'about.apps.AboutConfig',
+]
+
+MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATES = [
+    {
+        'BACKEND': 'core.perf.InstrumentedDjangoTemplates',
+        'NAME': 'django',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+        },
+    },
+]
+
+# Движок шаблонов лент и страницы поста: 'django' или 'jinja2'. Для
+# Jinja2 нужен одноимённый пакет, шаблоны лежат в каталоге jinja2.
+POSTS_TEMPLATE_ENGINE = os.environ.get('YATUBE_TEMPLATE_ENGINE', 'django')
+
+JINJA2_TEMPLATES = {
+    'BACKEND': 'core.jinja.InstrumentedJinja2',
+    'NAME': 'jinja2',
+    'DIRS': [os.path.join(BASE_DIR, 'jinja2')],
+    'OPTIONS': {
+        'environment': 'core.jinja.environment',
+        'context_processors': [
+            'django.contrib.auth.context_processors.auth',
+            'core.context_processors.year.year',
+        ],
+    },
+}
+
+if POSTS_TEMPLATE_ENGINE == 'jinja2':
+    TEMPLATES.append(JINJA2_TEMPLATES)
+
+# Компилировать шаблоны при старте WSGI-процесса (см. core.warmup).
+TEMPLATES_WARMUP = False
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    }
+}
+
+# PRAGMA, которые выполняются на каждом новом соединении с SQLite
+# (см. core.db.configure_sqlite).
+SQLITE_PRAGMAS = {}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yatube',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+# Страховочный срок жизни фрагментов: сбрасываются они сигналами.
+FRAGMENT_CACHE_TIMEOUT = 60 * 60
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+STATIC_URL = '/static/'
+STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+
+LOGIN_URL = 'users:login'
+LOGIN_REDIRECT_URL = 'posts:index'
+LOGOUT_REDIRECT_URL = ''
+
+# У auth.User нет get_absolute_url, а шаблоны ведут на профиль автора
+# через него. Функция импортируется при вызове, чтобы настройки не
+# загружали код приложений.
+ABSOLUTE_URL_OVERRIDES = {
+    'auth.user': lambda user: import_string('core.routes.profile_url')(user),
+}
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+# Начиная с этого числа постов главная лента берёт их количество из
+# статистики СУБД (ANALYZE), а не из COUNT(*).
+POSTS_COUNT_ESTIMATE_THRESHOLD = 100000
+
+# Выбор группы в форме поста через поиск по названию вместо полного
+# списка групп; имеет смысл, когда групп тысячи.
+POSTS_GROUP_AUTOCOMPLETE = False
+
+# Кеш групп по slug и авторов по username в памяти процесса: размер,
+# срок жизни найденных записей и отсутствующих значений, в секундах.
+POSTS_LOOKUP_CACHE_SIZE = 1000
+POSTS_LOOKUP_CACHE_TIMEOUT = 60
+POSTS_LOOKUP_CACHE_NEGATIVE_TIMEOUT = 10
+
+# Очередь фоновых задач, см. core/tasks.py.
+TASKS = {
+    'BACKEND': 'core.tasks.ThreadPoolBackend',
+    'OPTIONS': {
+        'max_workers': 2,
+    },
+}
+
+# Замеры PerformanceMiddleware: сколько последних запросов каждого view
+# хранить для перцентилей и отдавать ли заголовок Server-Timing. Заголовок
+# раскрывает число запросов к базе и тайминги, поэтому включён только в dev.
+PERF_SAMPLE_SIZE = 1000
+PERF_SERVER_TIMING = False
@@ -0,0 +1,10 @@
+from .base import *  # noqa: F401,F403
+
+DEBUG = True
+
+PERF_SERVER_TIMING = True
+
+# Задачи выполняются сразу, их ошибки видны в выводе runserver.
+TASKS = {
+    'BACKEND': 'core.tasks.ImmediateBackend',
+}
@@ -0,0 +1,87 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import (ALLOWED_HOSTS, DATABASES, JINJA2_TEMPLATES,
+                   POSTS_TEMPLATE_ENGINE, TEMPLATES_DIR)
+
+DEBUG = False
+
+# Ключ из base.py лежит в репозитории и в проде не годится.
+try:
+    SECRET_KEY = os.environ['SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Для профиля prod нужна переменная SECRET_KEY.')
+
+ALLOWED_HOSTS = os.environ.get(
+    'ALLOWED_HOSTS', ','.join(ALLOWED_HOSTS)
+).split(',')
+
+DATABASES = {
+    'default': {
+        **DATABASES['default'],
+        # Держим соединение между запросами вместо открытия на каждый.
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {
+            'timeout': 20,
+        },
+    }
+}
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Кеш общий для всех воркеров: поколения фрагментов и счётчики лент
+# должны сбрасываться во всех процессах сразу. Memcached вытесняет старые
+# записи сам, без обхода всего кеша на каждую запись, как FileBasedCache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': os.environ.get(
+            'YATUBE_MEMCACHED', '127.0.0.1:11211'
+        ).split(','),
+    }
+}
+
+TEMPLATES = [
+    {
+        'BACKEND': 'core.perf.InstrumentedDjangoTemplates',
+        'NAME': 'django',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+if POSTS_TEMPLATE_ENGINE == 'jinja2':
+    TEMPLATES.append(JINJA2_TEMPLATES)
+
+TEMPLATES_WARMUP = True
+
+# При нескольких воркерах задачи лучше хранить в общей очереди на диске
+# и разбирать отдельными процессами manage.py run_tasks.
+if os.environ.get('YATUBE_TASKS_DB'):
+    TASKS = {
+        'BACKEND': 'core.tasks.SQLiteBackend',
+        'OPTIONS': {
+            'path': os.environ['YATUBE_TASKS_DB'],
+        },
+    }
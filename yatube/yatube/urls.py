@@ -2,8 +2,11 @@
 from django.contrib import admin
 from django.urls import include, path
 
+from core.views import perf_stats
+
 urlpatterns = [
     path('', include('posts.urls', namespace="posts")),
+    path('admin/perf/', perf_stats, name='perf_stats'),
     path('admin/', admin.site.urls),
     path('auth/', include('users.urls', namespace='users')),
     path('auth/', include('django.contrib.auth.urls')),